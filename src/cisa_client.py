@@ -2,11 +2,50 @@
 
 import datetime
 import logging
-from typing import List, Dict, Any
+import os
+import pickle
+import tempfile
+import threading
+from typing import List, Dict, Any, Optional, Tuple
 
+import orjson
 import requests
 
-from src.config import CISA_KEV_FEED
+from src.config import CISA_KEV_FEED, CACHE_DIR
+from src.http_session import create_session
+
+# The KEV feed is kept in dateAdded order, so filter_recent_kevs walks it
+# from its newest end and stops after this many consecutive entries older
+# than the cutoff (tolerates entries submitted slightly out of order)
+KEV_OUT_OF_ORDER_TOLERANCE = 30
+
+
+def _parse_date_added(date_added_str: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a KEV dateAdded value into a (year, month, day) tuple.
+
+    CISA publishes dateAdded as "YYYY-MM-DD", so the fast path slices the
+    fixed-width fields directly instead of going through strptime, which
+    consults locale tables on every call.
+
+    Args:
+        date_added_str: dateAdded value from a KEV entry
+
+    Returns:
+        (year, month, day) tuple, or None if the value cannot be parsed
+    """
+    if len(date_added_str) >= 10 and date_added_str[4] == "-" and date_added_str[7] == "-":
+        try:
+            return int(date_added_str[0:4]), int(date_added_str[5:7]), int(date_added_str[8:10])
+        except ValueError:
+            pass
+
+    # Try ISO format as fallback
+    try:
+        parsed = datetime.datetime.fromisoformat(date_added_str.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+    return parsed.year, parsed.month, parsed.day
 
 
 class CISAClient:
@@ -15,12 +54,76 @@ class CISAClient:
     def __init__(self):
         """Initialize the CISA client."""
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.session = requests.Session()
+        self.session = create_session()
+        self.cache_file = CACHE_DIR / "cisa_kev.pickle"
+        # Serializes cache writes when one client is shared between threads
+        self._cache_lock = threading.Lock()
+        # Last parsed catalog and its HTTP validators, reused on 304 Not Modified
+        self._catalog = None
+        self._etag = None
+        self._last_modified = None
+
+    def _load_cached_catalog(self) -> None:
+        """Restore the KEV catalog and its HTTP validators from the on-disk cache."""
+        try:
+            with open(self.cache_file, "rb") as f:
+                cached = pickle.load(f)
+            catalog = cached["vulnerabilities"]
+            etag = cached.get("etag")
+            last_modified = cached.get("last_modified")
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            # Any unreadable or malformed cache is treated as a cache miss
+            self.logger.warning(f"Ignoring unreadable KEV cache {self.cache_file}: {e}")
+            return
+
+        if not isinstance(catalog, list):
+            self.logger.warning(f"Ignoring malformed KEV cache {self.cache_file}")
+            return
+
+        self._catalog = catalog
+        self._etag = etag
+        self._last_modified = last_modified
+
+    def _save_cached_catalog(self) -> None:
+        """
+        Persist the KEV catalog and its HTTP validators to the on-disk cache.
+
+        The cache is written to a temporary file and moved into place, so
+        readers never see a partially written file.
+        """
+        cached = {
+            "etag": self._etag,
+            "last_modified": self._last_modified,
+            "vulnerabilities": self._catalog
+        }
+        with self._cache_lock:
+            tmp_path = None
+            try:
+                self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+                with tempfile.NamedTemporaryFile(
+                    "wb", dir=self.cache_file.parent, prefix=self.cache_file.name, delete=False
+                ) as f:
+                    tmp_path = f.name
+                    pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.cache_file)
+            except OSError as e:
+                self.logger.warning(f"Could not write KEV cache {self.cache_file}: {e}")
+                if tmp_path is not None:
+                    try:
+                        os.remove(tmp_path)
+                    except OSError:
+                        pass
 
     def fetch_kev_catalog(self) -> List[Dict[str, Any]]:
         """
         Fetch the full CISA KEV catalog.
 
+        Issues a conditional GET using the validators of the last download
+        (kept in memory, or restored from disk after a restart); if the feed
+        is unchanged the previously parsed catalog is returned.
+
         Returns:
             List of vulnerability entries (raw JSON from feed)
 
@@ -30,21 +133,45 @@ class CISAClient:
         """
         self.logger.info(f"Fetching CISA KEV catalog from {CISA_KEV_FEED}")
 
+        if self._catalog is None:
+            self._load_cached_catalog()
+
+        # Send the validators from the last download so an unchanged feed
+        # comes back as 304 Not Modified with no body
+        headers = {}
+        if self._catalog is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
         try:
-            response = self.session.get(CISA_KEV_FEED, timeout=30)
+            response = self.session.get(CISA_KEV_FEED, headers=headers, timeout=30)
             response.raise_for_status()
         except requests.RequestException as e:
             self.logger.error(f"Error fetching CISA KEV feed: {e}")
             raise
 
+        if response.status_code == 304 and self._catalog is not None:
+            self.logger.info(f"CISA KEV feed not modified, using {len(self._catalog)} cached entries")
+            return self._catalog
+
         try:
-            data = response.json()
+            # Decode straight from the raw bytes: skips requests' charset
+            # detection and the intermediate str copy of the whole feed
+            data = orjson.loads(response.content)
         except ValueError as e:
             self.logger.error(f"Invalid JSON response from CISA KEV feed: {e}")
             raise
 
         # CISA KEV feed returns data under "vulnerabilities" key
         vulnerabilities = data.get("vulnerabilities", [])
+
+        self._catalog = vulnerabilities
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        if self._etag or self._last_modified:
+            self._save_cached_catalog()
         
         self.logger.info(f"Fetched {len(vulnerabilities)} total KEV entries")
         return vulnerabilities
@@ -59,37 +186,71 @@ class CISAClient:
         Returns:
             List of recent KEV entries filtered by dateAdded field
         """
-        # Fetch full catalog
-        all_kevs = self.fetch_kev_catalog()
+        return self.filter_recent_kevs(self.fetch_kev_catalog(), days)
+
+    def filter_recent_kevs(self, all_kevs: List[Dict[str, Any]], days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Select KEV entries added in the last N days from an already fetched catalog.
+
+        The catalog is walked from its newest end, whichever end that is
+        (the dateAdded of the first and last entries are compared), stopping
+        once entries are consistently older than the cutoff. If the order
+        cannot be told, every entry is checked.
+
+        Args:
+            all_kevs: Full KEV catalog as returned by fetch_kev_catalog
+            days: Number of days to look back (default: 7)
 
+        Returns:
+            List of recent KEV entries filtered by dateAdded field
+        """
         # Calculate cutoff date
-        cutoff_date = datetime.datetime.utcnow().date() - datetime.timedelta(days=days)
+        cutoff_date = datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=days)
         
         self.logger.info(f"Filtering KEV entries added on or after {cutoff_date}")
 
+        cutoff_tuple = (cutoff_date.year, cutoff_date.month, cutoff_date.day)
+
+        # Find the newest end of the catalog
+        first = _parse_date_added(all_kevs[0].get("dateAdded") or "") if all_kevs else None
+        last = _parse_date_added(all_kevs[-1].get("dateAdded") or "") if all_kevs else None
+        if first is None or last is None:
+            self.logger.warning("Cannot tell KEV catalog order; scanning every entry")
+            entries = all_kevs
+            oldest_first = False
+            tolerance = None
+        else:
+            oldest_first = first <= last
+            entries = reversed(all_kevs) if oldest_first else all_kevs
+            tolerance = KEV_OUT_OF_ORDER_TOLERANCE
+
         recent_kevs = []
-        for entry in all_kevs:
+        older_in_a_row = 0
+        for entry in entries:
             date_added_str = entry.get("dateAdded")
             if not date_added_str:
-                self.logger.debug(f"Entry missing dateAdded field: {entry.get('cveID', 'unknown')}")
+                self.logger.debug("Entry missing dateAdded field: %s", entry.get('cveID', 'unknown'))
                 continue
 
-            try:
-                # CISA KEV dateAdded is in "YYYY-MM-DD" format
-                date_added = datetime.datetime.strptime(date_added_str, "%Y-%m-%d").date()
-            except ValueError:
-                # Try ISO format as fallback
-                try:
-                    date_added = datetime.datetime.fromisoformat(date_added_str.replace('Z', '+00:00')).date()
-                except (ValueError, AttributeError) as e:
-                    self.logger.warning(
-                        f"Unrecognized date format for entry {entry.get('cveID', 'unknown')}: "
-                        f"{date_added_str} - {e}"
-                    )
-                    continue
-
-            if date_added >= cutoff_date:
+            date_added = _parse_date_added(date_added_str)
+            if date_added is None:
+                self.logger.warning(
+                    f"Unrecognized date format for entry {entry.get('cveID', 'unknown')}: "
+                    f"{date_added_str}"
+                )
+                continue
+
+            if date_added >= cutoff_tuple:
                 recent_kevs.append(entry)
+                older_in_a_row = 0
+            else:
+                older_in_a_row += 1
+                if tolerance is not None and older_in_a_row >= tolerance:
+                    break
+
+        # Restore feed order
+        if oldest_first:
+            recent_kevs.reverse()
 
         self.logger.info(f"Found {len(recent_kevs)} KEV entries added in the last {days} days")
         return recent_kevs
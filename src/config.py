@@ -1,8 +1,18 @@
 """Configuration settings for ICS Vulnerability Watchtower."""
 
+import os
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
 # NIST NVD API endpoint
 NVD_API_ENDPOINT = "https://services.nvd.nist.gov/rest/json/cves/2.0"
 
+# Optional NVD API key (raises the rate limit from 5 to 50 requests per 30 seconds)
+NVD_API_KEY = os.getenv("NVD_API_KEY")
+
 # CISA Known Exploited Vulnerabilities JSON feed
 CISA_KEV_FEED = "https://www.cisa.gov/sites/default/files/feeds/known_exploited_vulnerabilities.json"
 
@@ -24,3 +34,9 @@ CHECK_INTERVAL_HOURS = 6
 
 # Default days to look back for vulnerabilities (can be overridden in API)
 DEFAULT_DAYS_LOOKBACK = 30
+
+# How long the web dashboard reuses fetched NVD/CISA data before refetching (seconds)
+FETCH_CACHE_TTL_SECONDS = 60 * 60
+
+# Directory for on-disk HTTP caches (ETag / Last-Modified validators and payloads)
+CACHE_DIR = Path(__file__).parent.parent / ".cache"
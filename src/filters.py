@@ -1,10 +1,31 @@
 """Filters for ICS-related vulnerabilities."""
 
+import datetime
+import functools
 import logging
-from typing import List, Dict, Any
+import re
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional: pyahocorasick speeds up find_keywords
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
+# CPE format: cpe:2.3:part:vendor:product:version:update:edition:language:sw_edition:target_sw:target_hw:other
+# Captures the vendor and product fields (4th and 5th colon-separated parts)
+_CPE_VENDOR_PRODUCT_RE = re.compile(r"[^:]*:[^:]*:[^:]*:([^:]*):([^:]*)")
+
+# NVD CVSS metric keys in order of preference (v3.1, then v3.0, then v2 as fallback)
+_CVSS_METRIC_KEYS = ("cvssMetricV31", "cvssMetricV30", "cvssMetricV2")
+
+# Severity rating indexed by int(score * 10): 0.0 Unknown, 0.1-3.9 LOW,
+# 4.0-6.9 MEDIUM, 7.0-8.9 HIGH, 9.0-10.0 CRITICAL
+_SEVERITY_BY_TENTH = (
+    ("Unknown",) + ("LOW",) * 39 + ("MEDIUM",) * 30 + ("HIGH",) * 20 + ("CRITICAL",) * 11
+)
+
 
 def _extract_nvd_description(cve_obj: Dict[str, Any]) -> str:
     """
@@ -29,11 +50,37 @@ def _extract_nvd_description(cve_obj: Dict[str, Any]) -> str:
         if descriptions:
             return descriptions[0].get("value", "")
     except (KeyError, IndexError, AttributeError) as e:
-        logger.debug(f"Error extracting description: {e}")
+        logger.debug("Error extracting description: %s", e)
     
     return ""
 
 
+def _iter_cpe_vendors_products(nodes: List[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Yield vendor and product names from CPE matches in configuration nodes.
+
+    Walks nodes and their children depth-first in document order.
+
+    Args:
+        nodes: Configuration nodes from NVD API v2.0
+
+    Yields:
+        Vendor and product names (wildcards skipped)
+    """
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        for match in node.get("cpeMatch", ()):
+            cpe = _CPE_VENDOR_PRODUCT_RE.match(match.get("criteria", ""))
+            if cpe:
+                vendor, product = cpe.groups()
+                if vendor and vendor != "*":
+                    yield vendor
+                if product and product != "*":
+                    yield product
+        stack.extend(reversed(node.get("children", ())))
+
+
 def _extract_nvd_vendors_products(cve_obj: Dict[str, Any]) -> List[str]:
     """
     Extract vendor and product names from NVD CVE configurations.
@@ -48,41 +95,10 @@ def _extract_nvd_vendors_products(cve_obj: Dict[str, Any]) -> List[str]:
     
     try:
         cve = cve_obj.get("cve", {})
-        configurations = cve.get("configurations", [])
-        
-        for config in configurations:
-            nodes = config.get("nodes", [])
-            for node in nodes:
-                # Extract from cpeMatch (CPE strings contain vendor/product info)
-                cpe_match = node.get("cpeMatch", [])
-                for match in cpe_match:
-                    criteria = match.get("criteria", "")
-                    # CPE format: cpe:2.3:part:vendor:product:version:update:edition:language:sw_edition:target_sw:target_hw:other
-                    parts = criteria.split(":")
-                    if len(parts) >= 5:
-                        vendor = parts[3] if len(parts) > 3 else ""
-                        product = parts[4] if len(parts) > 4 else ""
-                        if vendor and vendor != "*":
-                            vendors_products.append(vendor)
-                        if product and product != "*":
-                            vendors_products.append(product)
-                
-                # Also check children nodes recursively
-                children = node.get("children", [])
-                for child in children:
-                    child_cpe_match = child.get("cpeMatch", [])
-                    for match in child_cpe_match:
-                        criteria = match.get("criteria", "")
-                        parts = criteria.split(":")
-                        if len(parts) >= 5:
-                            vendor = parts[3] if len(parts) > 3 else ""
-                            product = parts[4] if len(parts) > 4 else ""
-                            if vendor and vendor != "*":
-                                vendors_products.append(vendor)
-                            if product and product != "*":
-                                vendors_products.append(product)
+        for config in cve.get("configurations", []):
+            vendors_products.extend(_iter_cpe_vendors_products(config.get("nodes", [])))
     except (KeyError, IndexError, AttributeError) as e:
-        logger.debug(f"Error extracting vendors/products: {e}")
+        logger.debug("Error extracting vendors/products: %s", e)
     
     return vendors_products
 
@@ -98,31 +114,15 @@ def _get_nvd_cvss_score(cve_obj: Dict[str, Any]) -> float:
         CVSS base score or 0.0 if not found
     """
     try:
-        cve = cve_obj.get("cve", {})
-        metrics = cve.get("metrics", {})
-        
-        # Try CVSS v3.1 first
-        cvss_v31 = metrics.get("cvssMetricV31", [])
-        if cvss_v31:
-            base_score = cvss_v31[0].get("cvssData", {}).get("baseScore", 0.0)
-            if base_score:
-                return float(base_score)
-        
-        # Try CVSS v3.0
-        cvss_v30 = metrics.get("cvssMetricV30", [])
-        if cvss_v30:
-            base_score = cvss_v30[0].get("cvssData", {}).get("baseScore", 0.0)
-            if base_score:
-                return float(base_score)
-        
-        # Try CVSS v2 as fallback
-        cvss_v2 = metrics.get("cvssMetricV2", [])
-        if cvss_v2:
-            base_score = cvss_v2[0].get("cvssData", {}).get("baseScore", 0.0)
-            if base_score:
-                return float(base_score)
+        metrics = cve_obj.get("cve", {}).get("metrics", {})
+        for key in _CVSS_METRIC_KEYS:
+            entries = metrics.get(key)
+            if entries:
+                base_score = entries[0].get("cvssData", {}).get("baseScore")
+                if base_score:
+                    return float(base_score)
     except (KeyError, IndexError, ValueError, AttributeError) as e:
-        logger.debug(f"Error extracting CVSS score: {e}")
+        logger.debug("Error extracting CVSS score: %s", e)
     
     return 0.0
 
@@ -176,41 +176,27 @@ def get_severity_rating(cvss_score: float) -> str:
     Returns:
         Severity rating: CRITICAL, HIGH, MEDIUM, LOW, or Unknown
     """
-    if cvss_score == 0.0:
-        return "Unknown"
-    elif cvss_score >= 9.0:
-        return "CRITICAL"
-    elif cvss_score >= 7.0:
-        return "HIGH"
-    elif cvss_score >= 4.0:
-        return "MEDIUM"
-    elif cvss_score >= 0.1:
-        return "LOW"
-    else:
+    index = int(cvss_score * 10)
+    if index < 0:
         return "Unknown"
+    return _SEVERITY_BY_TENTH[min(index, 100)]
 
 
 def get_nvd_published_date(cve_obj: Dict[str, Any]) -> str:
     """
     Get published date from NVD CVE object.
 
+    NVD always emits a fixed-width "YYYY-MM-DDTHH:MM:SS.sss" timestamp, so the
+    date is the first ten characters; no parsing is needed.
+
     Args:
         cve_obj: CVE object from NVD API v2.0
 
     Returns:
         Published date in YYYY-MM-DD format or empty string
     """
-    try:
-        cve = cve_obj.get("cve", {})
-        published = cve.get("published", "")
-        if published:
-            # Format: 2025-01-15T12:34:56.789Z
-            date_part = published.split("T")[0]
-            return date_part
-    except (KeyError, AttributeError, IndexError) as e:
-        logger.debug(f"Error extracting published date: {e}")
-    
-    return ""
+    published = cve_obj.get("cve", {}).get("published") or ""
+    return published[:10] if len(published) >= 10 else ""
 
 
 def get_nvd_description(cve_obj: Dict[str, Any]) -> str:
@@ -248,6 +234,39 @@ def get_cisa_kev_details(kev_obj: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def parse_cve_date(cve_obj: Dict[str, Any]) -> Optional[datetime.date]:
+    """
+    Parse the date of a CVE object (NVD or CISA format).
+
+    Args:
+        cve_obj: CVE object from NVD API v2.0 or CISA KEV feed
+
+    Returns:
+        NVD published date or CISA KEV dateAdded, or None if missing or invalid
+    """
+    if "cve" in cve_obj:
+        value = get_nvd_published_date(cve_obj)
+    else:
+        value = (cve_obj.get("dateAdded") or "")[:10]
+
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def attach_parsed_dates(cve_list: Iterable[Dict[str, Any]]) -> None:
+    """
+    Parse each CVE object's date once and store it under "_parsed_date".
+
+    Args:
+        cve_list: Iterable of CVE objects (can be from NVD or CISA)
+    """
+    for cve_obj in cve_list:
+        if "_parsed_date" not in cve_obj:
+            cve_obj["_parsed_date"] = parse_cve_date(cve_obj)
+
+
 # Keep private versions for internal use
 def _get_nvd_cve_id(cve_obj: Dict[str, Any]) -> str:
     """Get CVE ID from NVD CVE object (internal)."""
@@ -259,77 +278,241 @@ def _get_cisa_cve_id(kev_obj: Dict[str, Any]) -> str:
     return get_cve_id(kev_obj)
 
 
-def _matches_keywords(text: str, keywords: List[str]) -> bool:
+@functools.lru_cache(maxsize=8)
+def _lowered_keywords(keywords: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Pair each keyword with its lowercase form.
+
+    Args:
+        keywords: Tuple of keywords (hashable so the result is cached)
+
+    Returns:
+        Tuple of (keyword, lowercase keyword) pairs
+    """
+    return tuple((keyword, keyword.lower()) for keyword in keywords)
+
+
+@functools.lru_cache(maxsize=8)
+def _keywords_automaton(keywords: Tuple[str, ...]):
     """
-    Check if any keyword appears in text (case-insensitive).
+    Build an Aho-Corasick automaton over the lowercase keywords.
+
+    Args:
+        keywords: Tuple of keywords (hashable so the automaton is cached)
+
+    Returns:
+        ahocorasick.Automaton whose values are the original keywords
+    """
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_lower in _lowered_keywords(keywords):
+        automaton.add_word(keyword_lower, keyword)
+    automaton.make_automaton()
+    return automaton
+
+
+def find_keywords(text: str, keywords: List[str]) -> List[str]:
+    """
+    Find which keywords appear in text (case-insensitive).
+
+    Uses a single Aho-Corasick pass when pyahocorasick is installed, and one
+    substring test per keyword otherwise. The fallback deliberately avoids a
+    case-insensitive regex alternation: on CVE descriptions that scan is an
+    order of magnitude slower than lowercasing once and testing substrings,
+    and its non-overlapping matches could miss keywords that overlap.
 
     Args:
         text: Text to search
         keywords: List of keywords to search for
 
     Returns:
-        True if any keyword is found
+        Matching keywords, each listed once
     """
     text_lower = text.lower()
-    for keyword in keywords:
-        if keyword.lower() in text_lower:
-            return True
-    return False
+    if ahocorasick is not None and keywords:
+        automaton = _keywords_automaton(tuple(keywords))
+        return list(dict.fromkeys(keyword for _, keyword in automaton.iter(text_lower)))
 
+    return [
+        keyword for keyword, keyword_lower in _lowered_keywords(tuple(keywords))
+        if keyword_lower in text_lower
+    ]
 
-def filter_ics_vulnerabilities(
-    cve_list: List[Dict[str, Any]],
+
+def _mentions_any(text: str, keywords_lower: Tuple[str, ...]) -> bool:
+    """
+    Check if text contains any of the keywords (case-insensitive).
+
+    Args:
+        text: Text to search
+        keywords_lower: Lowercase keywords
+
+    Returns:
+        True if any keyword appears in text
+    """
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in keywords_lower)
+
+
+def _matches_any(texts: Iterable[str], keywords_lower: Tuple[str, ...]) -> bool:
+    """
+    Check if any of the texts mentions a keyword, stopping at the first hit.
+
+    Args:
+        texts: Texts to search, most likely match first
+        keywords_lower: Lowercase keywords
+
+    Returns:
+        True if any text contains a keyword
+    """
+    return any(_mentions_any(text, keywords_lower) for text in texts)
+
+
+def build_cve_record(cve_obj: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract every field the pipeline needs from a CVE object in one pass.
+
+    Args:
+        cve_obj: CVE object from NVD API v2.0 or CISA KEV feed
+
+    Returns:
+        Flat record with keys: id, is_nvd, in_kev, cvss, description,
+        vendors_products, published and cve (the original object)
+    """
+    if "cve" in cve_obj:
+        return {
+            "id": _get_nvd_cve_id(cve_obj),
+            "is_nvd": True,
+            "in_kev": False,
+            "cvss": _get_nvd_cvss_score(cve_obj),
+            "description": _extract_nvd_description(cve_obj),
+            "vendors_products": _extract_nvd_vendors_products(cve_obj),
+            "published": get_nvd_published_date(cve_obj),
+            "cve": cve_obj,
+        }
+
+    # CISA KEV entries don't have CVSS scores in the feed
+    return {
+        "id": _get_cisa_cve_id(cve_obj),
+        "is_nvd": False,
+        "in_kev": True,
+        "cvss": 0.0,
+        "description": cve_obj.get("vulnerabilityName", "") or cve_obj.get("description", ""),
+        "vendors_products": [cve_obj.get("vendorProject", ""), cve_obj.get("product", "")],
+        "published": cve_obj.get("dateAdded", ""),
+        "cve": cve_obj,
+    }
+
+
+def _merge_kev_record(nvd_record: Dict[str, Any], kev_record: Dict[str, Any]) -> None:
+    """
+    Mark an NVD record as listed in CISA KEV, keeping the KEV entry on it.
+
+    Args:
+        nvd_record: Record built from an NVD CVE (updated in place)
+        kev_record: Record built from the matching CISA KEV entry
+    """
+    nvd_record["in_kev"] = True
+    nvd_record["kev"] = kev_record["cve"]
+    # Keep the KEV vendor/product names and vulnerability name searchable
+    # for the keyword filter: the ICS keyword may only appear in the KEV entry
+    nvd_record["vendors_products"] = (
+        nvd_record["vendors_products"]
+        + kev_record["vendors_products"]
+        + [kev_record["description"]]
+    )
+
+
+def deduplicate_records(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Collapse NVD and CISA KEV records that share a CVE ID into one record.
+
+    The NVD record is preferred since it carries the CVSS score; it is tagged
+    with in_kev=True and keeps the KEV entry under the "kev" key.
+
+    Args:
+        records: Records built by build_cve_record (NVD or CISA)
+
+    Returns:
+        Records with unique CVE IDs, in first-seen order
+    """
+    by_id = {}
+
+    for record in records:
+        # Records without an ID can't be matched; keep each one
+        key = record["id"] or id(record)
+        existing = by_id.get(key)
+        if existing is None:
+            by_id[key] = record
+        elif existing["is_nvd"] and not record["is_nvd"]:
+            _merge_kev_record(existing, record)
+        elif record["is_nvd"] and not existing["is_nvd"]:
+            _merge_kev_record(record, existing)
+            by_id[key] = record
+
+    return list(by_id.values())
+
+
+def filter_ics_records(
+    records: Iterable[Dict[str, Any]],
     keywords: List[str],
     min_severity: float = 7.0
 ) -> List[Dict[str, Any]]:
     """
-    Filter CVEs to only include ICS-related vulnerabilities with severity >= min_severity.
+    Filter CVE records to only include ICS-related vulnerabilities with severity >= min_severity.
 
     Args:
-        cve_list: List of CVE objects (can be from NVD or CISA)
+        records: Records built by build_cve_record (NVD or CISA)
         keywords: List of ICS-related keywords to search for
         min_severity: Minimum CVSS score (default: 7.0 for HIGH/CRITICAL)
 
     Returns:
-        Filtered list of ICS-related CVEs with severity >= min_severity
+        Filtered list of records
     """
+    if not keywords:
+        return []
+
+    keywords_lower = tuple(keyword_lower for _, keyword_lower in _lowered_keywords(tuple(keywords)))
+    # Checked once: even lazy %-formatting builds a LogRecord per call
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     filtered = []
-    
-    for cve_obj in cve_list:
-        # Determine if this is a NVD CVE (has 'cve' key) or CISA KEV entry
-        is_nvd = "cve" in cve_obj
-        
-        # Extract relevant fields based on source
-        if is_nvd:
-            # NVD CVE structure
-            description = _extract_nvd_description(cve_obj)
-            vendors_products = _extract_nvd_vendors_products(cve_obj)
-            cvss_score = _get_nvd_cvss_score(cve_obj)
-            cve_id = _get_nvd_cve_id(cve_obj)
-            
-            # Combine all searchable text
-            searchable_text = f"{description} {' '.join(vendors_products)}"
-        else:
-            # CISA KEV structure (simpler)
-            description = cve_obj.get("vulnerabilityName", "") or cve_obj.get("description", "")
-            vendor = cve_obj.get("vendorProject", "")
-            product = cve_obj.get("product", "")
-            searchable_text = f"{description} {vendor} {product}"
-            cve_id = _get_cisa_cve_id(cve_obj)
-            # CISA KEV entries don't have CVSS scores in the feed
-            # So we'll accept all that match keywords (severity check skipped)
-            cvss_score = 10.0  # Assume high severity for KEV entries
-        
-        # Check keyword match
-        if not _matches_keywords(searchable_text, keywords):
+
+    for record in records:
+        # Check severity first: a float compare is far cheaper than the
+        # keyword scan and rejects most NVD CVEs (only CVEs outside CISA KEV
+        # are gated; known exploited ones are accepted on keyword match alone
+        # since the KEV feed carries no CVSS score)
+        if not record["in_kev"] and record["cvss"] < min_severity:
             continue
-        
-        # Check severity (only for NVD CVEs, or skip for CISA KEV)
-        if is_nvd and cvss_score < min_severity:
+
+        # Check keyword match: description first (the usual hit), then each
+        # vendor/product name, without building a combined string
+        if not (_mentions_any(record["description"], keywords_lower)
+                or _matches_any(record["vendors_products"], keywords_lower)):
             continue
-        
+
         # Passed all filters
-        filtered.append(cve_obj)
-        logger.debug(f"Matched ICS CVE: {cve_id} (CVSS: {cvss_score:.1f})")
-    
+        filtered.append(record)
+        if debug_enabled:
+            logger.debug("Matched ICS CVE: %s (CVSS: %.1f)", record["id"], record["cvss"])
+
     return filtered
+
+
+def filter_ics_vulnerabilities(
+    cve_list: Iterable[Dict[str, Any]],
+    keywords: List[str],
+    min_severity: float = 7.0
+) -> List[Dict[str, Any]]:
+    """
+    Filter CVEs to only include ICS-related vulnerabilities with severity >= min_severity.
+
+    Args:
+        cve_list: Iterable of CVE objects (can be from NVD or CISA)
+        keywords: List of ICS-related keywords to search for
+        min_severity: Minimum CVSS score (default: 7.0 for HIGH/CRITICAL)
+
+    Returns:
+        Filtered list of ICS-related CVEs with severity >= min_severity
+    """
+    records = (build_cve_record(cve_obj) for cve_obj in cve_list)
+    return [record["cve"] for record in filter_ics_records(records, keywords, min_severity)]
@@ -0,0 +1,72 @@
+"""Shared HTTP session setup for the NVD and CISA clients."""
+
+import collections
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(retry: bool = True) -> requests.Session:
+    """
+    Create a requests session with connection pooling and retries.
+
+    Transient failures (rate limiting and 5xx responses) are retried with
+    exponential backoff, honouring any Retry-After header sent by the server.
+
+    Args:
+        retry: Retry transient failures in the adapter. Clients that pace
+            their own requests pass False and retry themselves, so that every
+            attempt goes through their rate limiter.
+
+    Returns:
+        Configured requests session
+    """
+    if retry:
+        max_retries = Retry(
+            total=5,
+            backoff_factor=1.0,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            allowed_methods=["GET"]
+        )
+    else:
+        max_retries = 0
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=max_retries)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter allowing max_calls per period seconds."""
+
+    def __init__(self, max_calls: int, period: float):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_calls: Maximum number of calls allowed within the window
+            period: Window length in seconds
+        """
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until another call fits in the window, then record it."""
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0] >= self.period:
+                self._calls.popleft()
+
+            if len(self._calls) >= self.max_calls:
+                # Wait for the oldest call to leave the window
+                time.sleep(self.period - (now - self._calls[0]))
+                self._calls.popleft()
+
+            self._calls.append(time.monotonic())
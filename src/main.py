@@ -2,6 +2,7 @@
 
 import sys
 import os
+import itertools
 from pathlib import Path
 
 # Add project root to Python path to allow running as script
@@ -13,7 +14,13 @@ import logging
 
 from src.nvd_client import NVDClient
 from src.cisa_client import CISAClient
-from src.filters import filter_ics_vulnerabilities
+from src.filters import (
+    build_cve_record,
+    deduplicate_records,
+    filter_ics_records,
+    get_severity_rating,
+    get_cisa_kev_details
+)
 from src.config import ICS_KEYWORDS
 
 # Configure logging
@@ -72,69 +79,60 @@ def main():
     logger.info("")
     logger.info("Applying ICS keyword filter...")
     
-    all_cves = nvd_cves + cisa_kevs
-    ics_filtered = filter_ics_vulnerabilities(all_cves, ICS_KEYWORDS, min_severity=7.0)
-    
-    # Count critical (CVSS >= 9.0) vulnerabilities
-    from src.filters import get_cve_id, get_cvss_score
+    # One record per CVE ID: NVD CVEs that are also in CISA KEV are merged
+    # into the NVD record (tagged in_kev) instead of being filtered twice
+    records = deduplicate_records(
+        build_cve_record(cve) for cve in itertools.chain(nvd_cves, cisa_kevs)
+    )
+    ics_records = filter_ics_records(records, ICS_KEYWORDS, min_severity=7.0)
     
+    # Count critical (CVSS >= 9.0) vulnerabilities and separate NVD CVEs
+    # from KEV-only entries for detailed display in the same pass
     critical_count = 0
     cve_ids = []
-    for cve in ics_filtered:
-        cve_id = get_cve_id(cve)
-        cvss_score = get_cvss_score(cve)
-        
-        # Count as critical if CVSS >= 9.0 or if it's from CISA KEV (known exploited)
-        is_cisa_kev = "cve" not in cve
-        if cvss_score >= 9.0 or (cvss_score == 0.0 and is_cisa_kev):
-            # CISA KEV entries are inherently critical (known exploited)
+    nvd_ics_records = []
+    cisa_ics_kevs = []
+    for record in ics_records:
+        # Count as critical if CVSS >= 9.0 or if it's in CISA KEV
+        # (known exploited vulnerabilities are inherently critical)
+        if record["cvss"] >= 9.0 or record["in_kev"]:
             critical_count += 1
         
-        if cve_id:
-            cve_ids.append(cve_id)
+        if record["id"]:
+            cve_ids.append(record["id"])
+        
+        if record["is_nvd"]:
+            nvd_ics_records.append(record)
+        else:
+            cisa_ics_kevs.append(record["cve"])
     
-    logger.info(f"Found {len(ics_filtered)} ICS-related vulnerabilities ({critical_count} critical)")
+    logger.info(f"Found {len(ics_records)} ICS-related vulnerabilities ({critical_count} critical)")
     logger.info("")
     
-    if not ics_filtered:
+    if not ics_records:
         logger.info("✅ Good news! No new ICS-related vulnerabilities found in the last 7 days.")
     else:
-        # Build set of CISA KEV CVE IDs for cross-referencing
-        cisa_kev_cve_ids = {get_cve_id(kev) for kev in cisa_kevs}
-        
         logger.info("CVE IDs of filtered results:")
         for cve_id in cve_ids:
             logger.info(f"  - {cve_id}")
         
         logger.info("")
-        logger.info(f"Found {len(ics_filtered)} ICS-related vulnerabilities:")
+        logger.info(f"Found {len(ics_records)} ICS-related vulnerabilities:")
         logger.info("")
         
-        # Separate NVD CVEs and CISA KEV entries for detailed display
-        nvd_ics_cves = [cve for cve in ics_filtered if "cve" in cve]
-        cisa_ics_kevs = [cve for cve in ics_filtered if "cve" not in cve]
-        
-        from src.filters import (
-            get_severity_rating,
-            get_nvd_published_date,
-            get_nvd_description,
-            get_cisa_kev_details
-        )
-        
         # Display NVD CVEs with details
-        for cve in nvd_ics_cves:
-            cve_id = get_cve_id(cve)
-            cvss_score = get_cvss_score(cve)
+        for record in nvd_ics_records:
+            cve_id = record["id"]
+            cvss_score = record["cvss"]
             severity_rating = get_severity_rating(cvss_score)
-            published_date = get_nvd_published_date(cve) or "Unknown"
-            description = get_nvd_description(cve) or "No description available"
+            published_date = record["published"] or "Unknown"
+            description = record["description"] or "No description available"
             
             # Truncate description to 150 characters
             description_short = description[:150] + "..." if len(description) > 150 else description
             
             # Check if in CISA KEV
-            is_in_kev = cve_id in cisa_kev_cve_ids
-            kev_status = "⚠️  YES - Actively exploited!" if is_in_kev else "No"
+            kev_status = "⚠️  YES - Actively exploited!" if record["in_kev"] else "No"
             
             # Format severity display
             if cvss_score > 0:
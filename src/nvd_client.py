@@ -1,13 +1,48 @@
 """NVD API client for fetching CVE data."""
 
-import time
+import asyncio
 import datetime
 import logging
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
 
+import orjson
 import requests
 
-from src.config import NVD_API_ENDPOINT
+from src.config import NVD_API_ENDPOINT, NVD_API_KEY
+from src.http_session import create_session, RateLimiter
+
+# Maximum page size accepted by the NVD API
+RESULTS_PER_PAGE = 2000
+
+# Concurrent page requests once the total number of results is known
+MAX_CONCURRENT_PAGES = 4
+
+# Attempts per page when NVD answers with rate limiting or a server error
+MAX_FETCH_ATTEMPTS = 4
+
+# Seconds to wait before retrying after a 429 or a 5xx response
+RATE_LIMITED_RETRY_DELAY = 30
+SERVER_ERROR_RETRY_DELAY = 10
+
+
+def _format_nvd_timestamp(value: datetime.datetime) -> str:
+    """
+    Format a UTC datetime as the ISO8601 timestamp NVD expects.
+
+    Built from the integer fields directly; strftime goes through the
+    locale machinery for what is a fixed layout.
+
+    Args:
+        value: UTC datetime
+
+    Returns:
+        Timestamp in YYYY-MM-DDTHH:mm:ss.000Z format
+    """
+    return (
+        f"{value.year:04d}-{value.month:02d}-{value.day:02d}"
+        f"T{value.hour:02d}:{value.minute:02d}:{value.second:02d}.000Z"
+    )
 
 
 class NVDClient:
@@ -16,45 +51,32 @@ class NVDClient:
     def __init__(self):
         """Initialize the NVD client."""
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.session = requests.Session()
-        # Rate limiting: 5 requests per 30 seconds without API key
-        # Using 6-second delay to stay well within limits
-        self.request_delay = 6
-
-    def fetch_recent_cves(self, days: int = 7) -> List[Dict[str, Any]]:
+        # Retries are done in _fetch_page so that each one is rate limited
+        self.session = create_session(retry=False)
+        # Rate limiting: 5 requests per 30 seconds without API key,
+        # 50 requests per 30 seconds with one
+        if NVD_API_KEY:
+            self.session.headers["apiKey"] = NVD_API_KEY
+            self.rate_limiter = RateLimiter(max_calls=50, period=30)
+        else:
+            self.rate_limiter = RateLimiter(max_calls=5, period=30)
+
+    def _fetch_page(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Fetch CVEs published in the last N days.
+        Fetch a single page of results from the NVD API.
+
+        Rate limiting (429) and server errors (5xx) are retried after a fixed
+        wait, up to MAX_FETCH_ATTEMPTS attempts. Every attempt goes through
+        the rate limiter.
 
         Args:
-            days: Number of days to look back (default: 7)
+            params: Query parameters including startIndex
 
         Returns:
-            List of CVE objects (raw JSON from API)
+            Parsed JSON response, or None on error
         """
-        # Calculate date range
-        end_date = datetime.datetime.utcnow()
-        start_date = end_date - datetime.timedelta(days=days)
-
-        # Format dates in ISO8601 format with UTC timezone (Z suffix)
-        # Format: YYYY-MM-DDTHH:mm:ss.sssZ
-        pub_start = start_date.strftime("%Y-%m-%dT%H:%M:%S.000") + "Z"
-        pub_end = end_date.strftime("%Y-%m-%dT%H:%M:%S.000") + "Z"
-
-        self.logger.info(
-            f"Fetching CVEs published between {pub_start} and {pub_end}"
-        )
-
-        results = []
-        start_index = 0
-        results_per_page = 2000  # Maximum to minimize requests
-
-        while True:
-            params = {
-                "pubStartDate": pub_start,
-                "pubEndDate": pub_end,
-                "startIndex": start_index,
-                "resultsPerPage": results_per_page,
-            }
+        for attempt in range(1, MAX_FETCH_ATTEMPTS + 1):
+            self.rate_limiter.acquire()
 
             try:
                 response = self.session.get(
@@ -64,64 +86,143 @@ class NVDClient:
                 )
             except requests.RequestException as e:
                 self.logger.error(f"Network error while querying NVD API: {e}")
-                break
+                return None
 
             # Handle HTTP errors
             if response.status_code == 429:
                 self.logger.warning(
-                    "Rate limit exceeded. Waiting 30 seconds before retry..."
+                    f"Rate limit exceeded (attempt {attempt}/{MAX_FETCH_ATTEMPTS})"
                 )
-                time.sleep(30)
-                continue
+                delay = RATE_LIMITED_RETRY_DELAY
             elif response.status_code >= 500:
                 self.logger.error(
-                    f"Server error {response.status_code}. Waiting 10 seconds..."
+                    f"Server error {response.status_code} "
+                    f"(attempt {attempt}/{MAX_FETCH_ATTEMPTS})"
                 )
-                time.sleep(10)
-                continue
+                delay = SERVER_ERROR_RETRY_DELAY
             elif response.status_code != 200:
                 self.logger.error(
                     f"NVD API returned status {response.status_code}: "
                     f"{response.text[:200]}"
                 )
-                break
+                return None
+            else:
+                # Parse JSON response
+                try:
+                    return orjson.loads(response.content)
+                except ValueError as e:
+                    self.logger.error(f"Invalid JSON response: {e}")
+                    return None
+
+            if attempt < MAX_FETCH_ATTEMPTS:
+                self.logger.debug(f"Waiting {delay} seconds before retrying...")
+                time.sleep(delay)
+
+        self.logger.error(f"Giving up on NVD page after {MAX_FETCH_ATTEMPTS} attempts")
+        return None
 
-            # Parse JSON response
-            try:
-                data = response.json()
-            except ValueError as e:
-                self.logger.error(f"Invalid JSON response: {e}")
-                break
+    def fetch_recent_cves(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Fetch CVEs published in the last N days.
 
-            # NVD API v2.0 returns vulnerabilities under "vulnerabilities" key
-            vulnerabilities = data.get("vulnerabilities", [])
-            
-            if not vulnerabilities:
-                self.logger.debug("No vulnerabilities in response")
-                break
+        Synchronous wrapper around fetch_recent_cves_async; must not be called
+        from a thread that is already running an event loop.
 
-            # Each item in vulnerabilities array is a vulnerability object
-            # Return raw JSON objects as requested
-            results.extend(vulnerabilities)
+        Args:
+            days: Number of days to look back (default: 7)
 
-            # Check if there are more pages
-            total_results = data.get("totalResults", 0)
-            self.logger.debug(
-                f"Fetched {len(vulnerabilities)} CVEs (page starting at {start_index}), "
-                f"total results: {total_results}"
-            )
+        Returns:
+            List of CVE objects (raw JSON from API)
 
-            start_index += results_per_page
+        Raises:
+            requests.RequestException: If the first page cannot be fetched
+        """
+        return asyncio.run(self.fetch_recent_cves_async(days))
 
-            # Check if we've fetched all results
-            if start_index >= total_results:
-                self.logger.debug("All CVEs fetched")
-                break
+    async def fetch_recent_cves_async(
+        self,
+        days: int = 7,
+        allow_partial: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch CVEs published in the last N days.
+
+        The first page is fetched on its own to learn totalResults; the
+        remaining pages are then requested concurrently, throttled by the
+        rate limiter. Requests run on the pooled session in worker threads,
+        so callers can await this alongside other I/O.
+
+        Args:
+            days: Number of days to look back (default: 7)
+            allow_partial: If a later page fails, return the pages fetched
+                before it instead of raising (default: True)
+
+        Returns:
+            List of CVE objects (raw JSON from API)
+
+        Raises:
+            requests.RequestException: If the first page cannot be fetched,
+                or any page when allow_partial is False
+        """
+        # Calculate date range
+        end_date = datetime.datetime.now(datetime.timezone.utc)
+        start_date = end_date - datetime.timedelta(days=days)
 
-            # Rate limiting: wait before next request
-            if start_index < total_results:
-                self.logger.debug(f"Waiting {self.request_delay} seconds before next request...")
-                time.sleep(self.request_delay)
+        # Format dates in ISO8601 format with UTC timezone (Z suffix)
+        pub_start = _format_nvd_timestamp(start_date)
+        pub_end = _format_nvd_timestamp(end_date)
+
+        self.logger.info(
+            f"Fetching CVEs published between {pub_start} and {pub_end}"
+        )
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+        async def fetch_page(start_index: int) -> Optional[Dict[str, Any]]:
+            params = {
+                "pubStartDate": pub_start,
+                "pubEndDate": pub_end,
+                "startIndex": start_index,
+                "resultsPerPage": RESULTS_PER_PAGE,
+            }
+            async with semaphore:
+                return await asyncio.to_thread(self._fetch_page, params)
+
+        data = await fetch_page(0)
+        if data is None:
+            raise requests.RequestException("Failed to fetch the first page of NVD results")
+
+        # NVD API v2.0 returns vulnerabilities under "vulnerabilities" key
+        # Each item is a vulnerability object; return raw JSON objects as requested
+        results = list(data.get("vulnerabilities", []))
+        total_results = data.get("totalResults", 0)
+        self.logger.debug(
+            "Fetched %d CVEs (page starting at 0), total results: %d",
+            len(results), total_results
+        )
+
+        start_indices = range(RESULTS_PER_PAGE, total_results, RESULTS_PER_PAGE)
+        pages = await asyncio.gather(*(fetch_page(start_index) for start_index in start_indices))
+
+        # Combine pages in order; stop at the first failed page so the
+        # results stay a contiguous prefix, as before
+        for start_index, page in zip(start_indices, pages):
+            if page is None:
+                if not allow_partial:
+                    raise requests.RequestException(
+                        f"Failed to fetch NVD results page starting at {start_index}"
+                    )
+                self.logger.warning(
+                    f"Stopping at page starting at {start_index}; "
+                    f"returning partial results"
+                )
+                break
+            vulnerabilities = page.get("vulnerabilities", [])
+            self.logger.debug(
+                "Fetched %d CVEs (page starting at %d)",
+                len(vulnerabilities), start_index
+            )
+            results.extend(vulnerabilities)
 
         self.logger.info(f"Fetched {len(results)} total CVEs")
         return results
@@ -2,22 +2,42 @@
 
 import sys
 import os
+import asyncio
+import functools
+import hashlib
+import heapq
+import itertools
+import operator
+import threading
+import time
+from bisect import bisect_left
 from pathlib import Path
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from collections import Counter
 
 # Add project root to Python path and store for Flask config
 project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from flask import Flask, render_template, jsonify
+from flask import Flask, render_template, jsonify, request
+from flask.json.provider import JSONProvider
 import logging
+import orjson
+
+try:
+    from flask_compress import Compress
+except ImportError:  # optional: flask-compress compresses API responses
+    Compress = None
 
 from src.nvd_client import NVDClient
 from src.cisa_client import CISAClient
 from src.filters import (
-    filter_ics_vulnerabilities,
+    attach_parsed_dates,
+    build_cve_record,
+    deduplicate_records,
+    filter_ics_records,
+    find_keywords,
     get_cve_id,
     get_cvss_score,
     get_severity_rating,
@@ -25,7 +45,12 @@ from src.filters import (
     get_nvd_description,
     get_cisa_kev_details
 )
-from src.config import ICS_KEYWORDS, CHECK_INTERVAL_HOURS, DEFAULT_DAYS_LOOKBACK
+from src.config import (
+    ICS_KEYWORDS,
+    CHECK_INTERVAL_HOURS,
+    DEFAULT_DAYS_LOOKBACK,
+    FETCH_CACHE_TTL_SECONDS
+)
 
 # Configure logging
 logging.basicConfig(
@@ -39,258 +64,739 @@ logger = logging.getLogger(__name__)
 template_dir = project_root / 'templates'
 static_dir = project_root / 'static'
 
+
+class ORJSONProvider(JSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib json module."""
+    
+    # Statistics are keyed by whatever the data contains, so allow non-str keys
+    # the way the stdlib encoder does
+    option = orjson.OPT_NON_STR_KEYS
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string."""
+        return orjson.dumps(obj, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        """Deserialize a JSON string or bytes."""
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Serialize the arguments straight to a JSON response body."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=self.option),
+            mimetype='application/json'
+        )
+
+
 app = Flask(
     __name__,
     template_folder=str(template_dir),
     static_folder=str(static_dir)
 )
+app.json = ORJSONProvider(app)
 app.config['JSON_SORT_KEYS'] = False
+if Compress is not None:
+    Compress(app)
+
 
+class TTLCache:
+    """Small thread-safe cache whose entries expire after a fixed time."""
+    
+    def __init__(self, maxsize, ttl):
+        """
+        Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of entries (oldest evicted first)
+            ttl: Entry lifetime in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+    
+    def set(self, key, value):
+        """Store value under key, evicting the oldest entries beyond maxsize."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            while len(self._entries) > self.maxsize:
+                del self._entries[next(iter(self._entries))]
 
-def fetch_and_filter_data(days=7):
+
+# Shared clients, so their HTTP sessions keep connections alive (and the CISA
+# client keeps its conditional-request validators) across requests
+_nvd_client = NVDClient()
+_cisa_client = CISAClient()
+
+# Upstream fetch results keyed by (endpoint, days), so dashboard reloads
+# within the TTL are served from memory instead of the network
+_fetch_cache = TTLCache(maxsize=16, ttl=FETCH_CACHE_TTL_SECONDS)
+
+
+async def _cached_fetch(key, fetch):
     """
-    Fetch and filter ICS vulnerabilities from both sources.
+    Return the cached result for key, or await fetch() and cache it.
+    
+    Exceptions raised by fetch() are not cached, so the next request
+    retries the upstream.
+    """
+    value = _fetch_cache.get(key)
+    if value is None:
+        value = await fetch()
+        _fetch_cache.set(key, value)
+    return value
+
+
+async def _fetch_kev_catalog_with_ids():
+    """
+    Fetch the full CISA KEV catalog and the set of CVE IDs it contains.
+    
+    The ID set is cached with the catalog so it is built once per TTL window
+    rather than on every request. It is an exact frozenset rather than a
+    probabilistic filter: a false positive would mark a CVE as known
+    exploited on the dashboard.
     
     Returns:
-        Tuple of (filtered_cves, nvd_cves, cisa_kevs, cisa_kev_cve_ids)
+        Tuple of (catalog, frozenset of CVE IDs)
     """
-    logger.info("Fetching data from NVD and CISA...")
+    catalog = await asyncio.to_thread(_cisa_client.fetch_kev_catalog)
+    cve_ids = frozenset(cve_id for cve_id in map(get_cve_id, catalog) if cve_id)
+    return catalog, cve_ids
+
+
+async def _gather_sources(days):
+    """
+    Fetch NVD CVEs and the full CISA KEV catalog concurrently.
     
-    # Fetch from NVD
-    nvd_client = NVDClient()
-    try:
-        nvd_cves = nvd_client.fetch_recent_cves(days=days)
-    except Exception as e:
-        logger.error(f"Error fetching NVD data: {e}", exc_info=True)
+    Returns:
+        Tuple of (nvd_result, (kev_catalog, kev_cve_ids) result); either may
+        be an exception
+    """
+    return await asyncio.gather(
+        _cached_fetch(
+            ('nvd', days),
+            # Partial results raise instead, so they are not cached
+            lambda: _nvd_client.fetch_recent_cves_async(days=days, allow_partial=False)
+        ),
+        _cached_fetch(
+            ('cisa_kev_catalog',),
+            _fetch_kev_catalog_with_ids
+        ),
+        return_exceptions=True
+    )
+
+
+def fetch_sources(days=7, raise_errors=False):
+    """
+    Fetch raw data from both sources, overlapping the network waits.
+    
+    The KEV catalog is downloaded once and the recent entries are selected
+    from it locally.
+    
+    Args:
+        days: Number of days to look back
+        raise_errors: Raise the first upstream error instead of treating
+            the failed source as empty
+    
+    Returns:
+        Tuple of (nvd_cves, cisa_kevs, all_cisa_kevs, all_cisa_kev_cve_ids)
+    """
+    nvd_result, catalog_result = asyncio.run(_gather_sources(days))
+    
+    if raise_errors:
+        for result in (nvd_result, catalog_result):
+            if isinstance(result, Exception):
+                raise result
+    
+    if isinstance(nvd_result, Exception):
+        logger.error(f"Error fetching NVD data: {nvd_result}", exc_info=nvd_result)
         nvd_cves = []
+    else:
+        nvd_cves = nvd_result
     
-    # Fetch from CISA (recent entries)
-    cisa_client = CISAClient()
-    try:
-        cisa_kevs = cisa_client.get_recent_kevs(days=days)
-    except Exception as e:
-        logger.error(f"Error fetching CISA KEV data: {e}", exc_info=True)
+    if isinstance(catalog_result, Exception):
+        logger.error(f"Error fetching CISA KEV catalog: {catalog_result}", exc_info=catalog_result)
+        all_cisa_kevs = []
+        all_cisa_kev_cve_ids = frozenset()
         cisa_kevs = []
+    else:
+        all_cisa_kevs, all_cisa_kev_cve_ids = catalog_result
+        cisa_kevs = _cisa_client.filter_recent_kevs(all_cisa_kevs, days=days)
+    
+    return nvd_cves, cisa_kevs, all_cisa_kevs, all_cisa_kev_cve_ids
+
+
+def filter_sources(nvd_cves, cisa_kevs):
+    """
+    Filter ICS vulnerabilities from both sources, one entry per CVE ID.
+    
+    NVD CVEs that are also in the CISA KEV entries are merged into the NVD
+    record (tagged in_kev) instead of being filtered and counted twice.
+    The result is kept as separate NVD and CISA KEV lists so that consumers
+    can process each shape without testing every entry.
+    
+    Returns:
+        Tuple of (nvd_items, kev_items), where nvd_items holds
+        (nvd_cve, merged_kev_entry_or_None) pairs
+    """
+    records = deduplicate_records(
+        build_cve_record(cve) for cve in itertools.chain(nvd_cves, cisa_kevs)
+    )
+    
+    nvd_items = []
+    kev_items = []
+    for record in filter_ics_records(records, ICS_KEYWORDS, min_severity=7.0):
+        if record["is_nvd"]:
+            nvd_items.append((record["cve"], record.get("kev")))
+        else:
+            kev_items.append(record["cve"])
+    
+    return nvd_items, kev_items
+
+
+def fetch_and_filter_data(days=7, raise_errors=False):
+    """
+    Fetch and filter ICS vulnerabilities from both sources.
+    
+    Args:
+        days: Number of days to look back
+        raise_errors: Raise upstream errors instead of treating the failed
+            source as empty
+    
+    Returns:
+        Tuple of ((nvd_items, kev_items), nvd_cves, cisa_kevs, cisa_kev_cve_ids)
+    """
+    logger.info("Fetching data from NVD and CISA...")
     
-    # Also fetch ALL CISA KEV catalog for cross-referencing
-    # This ensures we mark NVD CVEs as CISA KEV even if they weren't added to KEV recently
+    # CISA KEV CVE IDs come from the FULL catalog for cross-referencing
+    # This way NVD CVEs will be marked as CISA KEV even if they were added to KEV long ago
+    nvd_cves, cisa_kevs, _, cisa_kev_cve_ids = fetch_sources(days, raise_errors=raise_errors)
+    
+    # Parse dates once for the timeline and the snapshot's window indexes
+    attach_parsed_dates(nvd_cves)
+    attach_parsed_dates(cisa_kevs)
+    
+    return filter_sources(nvd_cves, cisa_kevs), nvd_cves, cisa_kevs, cisa_kev_cve_ids
+
+
+def utc_timestamp():
+    """Return the current UTC time as an ISO8601 string with a Z suffix."""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+
+
+# Latest precomputed data for the default lookback window, replaced
+# wholesale by the background refresher so readers never see a partial update
+_snapshot = None
+
+
+def _nvd_date_key(cve):
+    """Return the published timestamp of an NVD CVE."""
+    return cve["cve"].get("published") or ""
+
+
+def _kev_date_key(kev):
+    """Return the parsed dateAdded date of a CISA KEV entry."""
+    return kev["_parsed_date"] or date.min
+
+
+def build_date_index(items, date_key):
+    """
+    Index items by date so that any trailing window can be found by bisection.
+    
+    Args:
+        items: List of CVE objects
+        date_key: Function returning a sortable date or timestamp for an item
+    
+    Returns:
+        Tuple of (sorted date keys, item positions in the same order)
+    """
+    keyed = sorted((key, position) for position, key in enumerate(map(date_key, items)))
+    return [key for key, _ in keyed], [position for _, position in keyed]
+
+
+def _positions_since(date_index, cutoff):
+    """Return positions of indexed items whose date key is >= cutoff."""
+    keys, positions = date_index
+    return positions[bisect_left(keys, cutoff):]
+
+
+def _select_window(items, positions):
+    """Return the items at the given positions, in their original order."""
+    return [items[position] for position in sorted(positions)]
+
+
+def refresh_snapshot(days=DEFAULT_DAYS_LOOKBACK):
+    """
+    Fetch and filter data for the given window and publish it as the snapshot.
+    
+    The snapshot also carries date indexes so that shorter windows can be
+    sliced out of it instead of being fetched and filtered again. If either
+    source fails, the error is raised and the previous snapshot is kept.
+    
+    Args:
+        days: Number of days the snapshot covers
+    """
+    global _snapshot
+    
+    (nvd_items, kev_items), nvd_cves, cisa_kevs, cisa_kev_cve_ids = fetch_and_filter_data(
+        days, raise_errors=True
+    )
+    _snapshot = {
+        'days': days,
+        'built_at': utc_timestamp(),
+        'nvd_items': nvd_items,
+        'kev_items': kev_items,
+        'nvd_cves': nvd_cves,
+        'cisa_kevs': cisa_kevs,
+        'cisa_kev_cve_ids': cisa_kev_cve_ids,
+        'nvd_cves_index': build_date_index(nvd_cves, _nvd_date_key),
+        'cisa_kevs_index': build_date_index(cisa_kevs, _kev_date_key)
+    }
+    logger.info(
+        f"Snapshot refreshed: {len(nvd_items) + len(kev_items)} ICS vulnerabilities "
+        f"in the last {days} days"
+    )
+
+
+def _refresh_once():
+    """Refresh the snapshot, logging failures, and flag the first attempt as done."""
     try:
-        all_cisa_kevs = cisa_client.fetch_kev_catalog()
+        refresh_snapshot()
     except Exception as e:
-        logger.error(f"Error fetching full CISA KEV catalog: {e}", exc_info=True)
-        all_cisa_kevs = []
+        logger.error(f"Error refreshing snapshot, keeping the previous one: {e}", exc_info=True)
+    finally:
+        _first_refresh_done.set()
+
+
+def _refresh_loop(interval_seconds):
+    """Refresh the snapshot forever, sleeping interval_seconds between runs."""
+    while True:
+        _refresh_once()
+        time.sleep(interval_seconds)
+
+
+# Background refresher thread, started at most once per process
+_refresh_thread = None
+_refresh_thread_lock = threading.Lock()
+
+# Set once the refresher's first attempt has finished, whether or not it
+# produced a snapshot
+_first_refresh_done = threading.Event()
+
+
+def start_background_refresh():
+    """
+    Start a daemon thread that refreshes the snapshot every CHECK_INTERVAL_HOURS.
     
-    # Combine and filter
-    all_cves = nvd_cves + cisa_kevs
-    ics_filtered = filter_ics_vulnerabilities(all_cves, ICS_KEYWORDS, min_severity=7.0)
+    Does nothing if the thread is already running in this process.
+    """
+    global _refresh_thread
+    
+    with _refresh_thread_lock:
+        if _refresh_thread is not None:
+            return
+        _refresh_thread = threading.Thread(
+            target=_refresh_loop,
+            args=(CHECK_INTERVAL_HOURS * 3600,),
+            name='snapshot-refresher',
+            daemon=True
+        )
+        _refresh_thread.start()
+
+
+@app.before_request
+def _ensure_background_refresh():
+    """
+    Start the snapshot refresher in the process that serves requests.
     
-    # Build CISA KEV CVE ID set from FULL catalog for cross-referencing
-    # This way NVD CVEs will be marked as CISA KEV even if they were added to KEV long ago
-    cisa_kev_cve_ids = {get_cve_id(kev) for kev in all_cisa_kevs if get_cve_id(kev)}
+    Starting it here rather than at import or in __main__ covers the debug
+    reloader, flask run and WSGI servers alike.
+    """
+    if _refresh_thread is None and not app.testing:
+        start_background_refresh()
+
+
+def slice_snapshot(snapshot, days):
+    """
+    Derive the data for a window no longer than the snapshot's from its
+    date indexes, filtering only the entries inside the window.
+    
+    Uses the same cutoffs as the clients: NVD CVEs published since now - days,
+    and KEV entries added on or after today - days.
+    
+    Returns:
+        Tuple of ((nvd_items, kev_items), nvd_cves, cisa_kevs, cisa_kev_cve_ids)
+    """
+    # Naive UTC, comparable with NVD's published timestamps
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    nvd_cutoff = (now - timedelta(days=days)).isoformat(timespec='milliseconds')
+    kev_cutoff = now.date() - timedelta(days=days)
+    
+    def window(name, cutoff):
+        positions = _positions_since(snapshot[f'{name}_index'], cutoff)
+        return _select_window(snapshot[name], positions)
+    
+    # Filtered afresh rather than sliced: whether an NVD CVE and a KEV entry
+    # are merged depends on both being inside the window
+    nvd_cves = window('nvd_cves', nvd_cutoff)
+    cisa_kevs = window('cisa_kevs', kev_cutoff)
+    return (
+        filter_sources(nvd_cves, cisa_kevs),
+        nvd_cves,
+        cisa_kevs,
+        snapshot['cisa_kev_cve_ids']
+    )
+
+
+def get_filtered_data(days):
+    """
+    Get filtered data for a window, from the snapshot when it covers it.
     
-    return ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids
+    Shorter windows are sliced out of the snapshot. Before the first
+    snapshot exists, requests for windows it will cover wait for the
+    refresher's first attempt instead of fetching the same data alongside
+    it. Falls back to fetching on demand for longer windows, or if that
+    attempt failed.
+    
+    Returns:
+        Tuple of ((nvd_items, kev_items), nvd_cves, cisa_kevs, cisa_kev_cve_ids,
+        built_at), where built_at is the snapshot build time when the data is the snapshot
+        itself, and None otherwise
+    """
+    snapshot = _snapshot
+    if snapshot is None and _refresh_thread is not None and days <= DEFAULT_DAYS_LOOKBACK:
+        _first_refresh_done.wait()
+        snapshot = _snapshot
+    if snapshot is None or days > snapshot['days']:
+        return fetch_and_filter_data(days) + (None,)
+    if days == snapshot['days']:
+        return (
+            (snapshot['nvd_items'], snapshot['kev_items']),
+            snapshot['nvd_cves'],
+            snapshot['cisa_kevs'],
+            snapshot['cisa_kev_cve_ids'],
+            snapshot['built_at']
+        )
+    return slice_snapshot(snapshot, days) + (None,)
 
 
-def aggregate_statistics(ics_filtered, nvd_cves, cisa_kevs):
+def conditional_response(response, built_at):
     """
-    Aggregate statistics for charts and dashboard.
+    Tag a response built from the snapshot with an ETag derived from its
+    build time, answering 304 Not Modified if the client already has it.
+    
+    Args:
+        response: Flask response object
+        built_at: Snapshot build time, or None for data fetched on demand
     
     Returns:
-        Dictionary with statistics
+        The response, possibly turned into a 304
     """
+    if built_at is None:
+        return response
+    response.set_etag(hashlib.md5(built_at.encode()).hexdigest())
+    return response.make_conditional(request)
+
+
+def build_response(ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids):
+    """
+    Format CVE data for the JSON API and aggregate dashboard statistics in a
+    single pass over the filtered CVEs.
+    
+    Args:
+        ics_filtered: Tuple of (filtered (NVD CVE, merged KEV entry or None)
+            pairs, filtered CISA KEV entries)
+        nvd_cves: All NVD CVEs in the window
+        cisa_kevs: All CISA KEV entries in the window
+        cisa_kev_cve_ids: CVE IDs in the full CISA KEV catalog
+    
+    Returns:
+        Tuple of (list of formatted CVE dictionaries, statistics dictionary)
+    """
+    nvd_items, kev_items = ics_filtered
+    formatted = []
     stats = {
-        'total_ics': len(ics_filtered),
+        'total_ics': len(nvd_items) + len(kev_items),
         'total_nvd': len(nvd_cves),
         'total_cisa': len(cisa_kevs),
-        'critical_count': 0,
-        'severity_distribution': defaultdict(int),
-        'timeline_data': defaultdict(int),
-        'vendor_product_count': defaultdict(int),
-        'cisa_kev_count': 0,
+        # CISA KEV entries have no CVSS score and are all critical
+        'critical_count': len(kev_items),
+        'cisa_kev_count': len(kev_items),
         'nvd_only_count': 0
     }
     
-    cisa_kev_cve_ids = {get_cve_id(kev) for kev in cisa_kevs}
+    # Collect the keys to count and tally them once at the end
+    severities = []
+    timeline_keys = []
+    vendor_keys = []
     
-    # Process filtered vulnerabilities
-    for cve in ics_filtered:
+    for cve, kev in nvd_items:
         cve_id = get_cve_id(cve)
         cvss_score = get_cvss_score(cve)
-        is_cisa_kev = "cve" not in cve
-        is_in_kev = cve_id in cisa_kev_cve_ids
+        # Statistics count KEV membership within the window (the merged
+        # entry); the formatted entries flag membership anywhere in the
+        # full catalog
+        is_in_kev = kev is not None
         
         # Severity distribution
-        if is_cisa_kev or is_in_kev:
+        if is_in_kev:
             severity_rating = "CRITICAL"  # CISA KEV entries are critical
         elif cvss_score > 0:
             severity_rating = get_severity_rating(cvss_score)
         else:
             severity_rating = "Unknown"
         
-        stats['severity_distribution'][severity_rating] += 1
+        severities.append(severity_rating)
         
         # Critical count (>= 9.0 or CISA KEV)
-        if cvss_score >= 9.0 or (cvss_score == 0.0 and (is_cisa_kev or is_in_kev)):
+        if cvss_score >= 9.0 or is_in_kev:
             stats['critical_count'] += 1
         
-        # Timeline data
-        if "cve" in cve:
-            published_date = get_nvd_published_date(cve)
-            if published_date:
-                stats['timeline_data'][published_date] += 1
-        else:
-            # CISA KEV entry
-            kev_details = get_cisa_kev_details(cve)
-            date_added = kev_details.get('date_added', '')
-            if date_added:
-                stats['timeline_data'][date_added] += 1
-        
-        # Vendor/Product breakdown
-        if "cve" in cve:
-            # For NVD, try to extract vendor/product from description/configurations
-            description = get_nvd_description(cve).lower()
-            for keyword in ICS_KEYWORDS:
-                if keyword.lower() in description:
-                    stats['vendor_product_count'][keyword] += 1
-        else:
-            # CISA KEV entry
-            kev_details = get_cisa_kev_details(cve)
-            vendor = kev_details.get('vendor_project', '')
-            product = kev_details.get('product', '')
-            if vendor:
-                stats['vendor_product_count'][vendor] += 1
-            if product:
-                stats['vendor_product_count'][f"{vendor} - {product}"] += 1
-        
         # CISA KEV tracking
-        if is_in_kev or is_cisa_kev:
+        if is_in_kev:
             stats['cisa_kev_count'] += 1
         else:
             stats['nvd_only_count'] += 1
+        
+        # Timeline data
+        if cve['_parsed_date']:
+            timeline_keys.append(cve['_parsed_date'])
+        
+        # Vendor/Product breakdown: for NVD, count the ICS keywords
+        # mentioned in the description
+        description = get_nvd_description(cve)
+        vendor_keys.extend(find_keywords(description, ICS_KEYWORDS))
+        
+        # Truncated for display; the full text is served by /api/cve/<id>
+        entry = {
+            'cve_id': cve_id,
+            'severity_score': cvss_score if cvss_score > 0 else None,
+            # Rated as counted in the severity distribution
+            'severity_rating': "CRITICAL" if is_in_kev else get_severity_rating(cvss_score),
+            'published_date': get_nvd_published_date(cve) or "Unknown",
+            'description': description[:200] or "No description available",
+            'is_cisa_kev': cve_id in cisa_kev_cve_ids,
+            'source': 'NVD'
+        }
+        
+        # Carry the merged KEV details the dashboard shows for KEV entries
+        if is_in_kev:
+            kev_details = get_cisa_kev_details(kev)
+            entry.update({
+                'vendor_project': kev_details.get('vendor_project', ''),
+                'product': kev_details.get('product', ''),
+                'due_date': kev_details.get('due_date', ''),
+                'known_ransomware_use': kev_details.get('known_ransomware_use', 'Unknown'),
+                'notes': kev_details.get('notes', '')
+            })
+        
+        formatted.append(entry)
     
-    return stats
+    severities.extend(["CRITICAL"] * len(kev_items))
+    
+    for kev in kev_items:
+        kev_details = get_cisa_kev_details(kev)
+        
+        # Timeline data
+        if kev['_parsed_date']:
+            timeline_keys.append(kev['_parsed_date'])
+        
+        # Vendor/Product breakdown
+        vendor = kev_details['vendor_project']
+        product = kev_details['product']
+        if vendor:
+            vendor_keys.append(vendor)
+        if product:
+            vendor_keys.append(f"{vendor} - {product}")
+        
+        formatted.append({
+            'cve_id': kev_details['cve_id'],
+            'severity_score': None,
+            'severity_rating': 'CRITICAL',  # All KEV entries are critical
+            'published_date': kev_details.get('date_added', 'Unknown'),
+            'description': kev_details.get('vulnerability_name', ''),
+            'is_cisa_kev': True,
+            'source': 'CISA KEV',
+            'vendor_project': kev_details.get('vendor_project', ''),
+            'product': kev_details.get('product', ''),
+            'due_date': kev_details.get('due_date', ''),
+            'known_ransomware_use': kev_details.get('known_ransomware_use', 'Unknown'),
+            'notes': kev_details.get('notes', '')
+        })
+    
+    stats['severity_distribution'] = Counter(severities)
+    stats['timeline_data'] = Counter(timeline_keys)
+    stats['vendor_product_count'] = Counter(vendor_keys)
+    
+    return formatted, stats
 
 
-def format_cve_data(ics_filtered, cisa_kev_cve_ids):
+def summarize_statistics(stats, days, last_updated):
     """
-    Format CVE data for JSON API response.
+    Prepare aggregated statistics for the JSON API: plain dicts plus the
+    sorted timeline and top-10 vendor/product series the charts plot.
+    
+    Args:
+        stats: Statistics dictionary from build_response
+        days: Number of days the statistics cover
+        last_updated: ISO8601 timestamp of the underlying data
     
     Returns:
-        List of formatted CVE dictionaries
+        The updated statistics dictionary
     """
-    formatted = []
+    stats['days'] = days
     
-    for cve in ics_filtered:
-        cve_id = get_cve_id(cve)
-        is_nvd = "cve" in cve
-        is_in_kev = cve_id in cisa_kev_cve_ids
-        
-        if is_nvd:
-            # NVD CVE format
-            cvss_score = get_cvss_score(cve)
-            severity_rating = get_severity_rating(cvss_score)
-            published_date = get_nvd_published_date(cve) or "Unknown"
-            description = get_nvd_description(cve) or "No description available"
-            
-            formatted.append({
-                'cve_id': cve_id,
-                'severity_score': cvss_score if cvss_score > 0 else None,
-                'severity_rating': severity_rating,
-                'published_date': published_date,
-                'description': description[:200],  # Truncate for display
-                'full_description': description,
-                'is_cisa_kev': is_in_kev,
-                'source': 'NVD'
-            })
-        else:
-            # CISA KEV format
-            kev_details = get_cisa_kev_details(cve)
-            
-            formatted.append({
-                'cve_id': kev_details['cve_id'],
-                'severity_score': None,
-                'severity_rating': 'CRITICAL',  # All KEV entries are critical
-                'published_date': kev_details.get('date_added', 'Unknown'),
-                'description': kev_details.get('vulnerability_name', ''),
-                'full_description': kev_details.get('vulnerability_name', ''),
-                'is_cisa_kev': True,
-                'source': 'CISA KEV',
-                'vendor_project': kev_details.get('vendor_project', ''),
-                'product': kev_details.get('product', ''),
-                'due_date': kev_details.get('due_date', ''),
-                'known_ransomware_use': kev_details.get('known_ransomware_use', 'Unknown'),
-                'notes': kev_details.get('notes', '')
-            })
+    # Convert Counters to regular dicts for JSON serialization
+    stats['severity_distribution'] = dict(stats['severity_distribution'])
+    stats['timeline_data'] = dict(stats['timeline_data'])
+    stats['vendor_product_count'] = dict(stats['vendor_product_count'])
     
-    return formatted
+    # Sort timeline data by date
+    timeline_sorted = sorted(stats['timeline_data'].items())
+    stats['timeline_dates'] = [item[0] for item in timeline_sorted]
+    stats['timeline_counts'] = [item[1] for item in timeline_sorted]
+    
+    # Sort vendor/product by count (top 10)
+    vendor_sorted = heapq.nlargest(
+        10,
+        stats['vendor_product_count'].items(),
+        key=operator.itemgetter(1)
+    )
+    stats['vendor_labels'] = [item[0] for item in vendor_sorted]
+    stats['vendor_counts'] = [item[1] for item in vendor_sorted]
+    
+    stats['last_updated'] = last_updated
+    
+    return stats
+
+
+def validated_days(view):
+    """
+    Pass the view the 'days' query parameter as a days keyword argument,
+    defaulting to DEFAULT_DAYS_LOOKBACK and clamped to 1-365.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        days = request.args.get('days', default=DEFAULT_DAYS_LOOKBACK, type=int)
+        kwargs['days'] = max(1, min(days, 365))  # Limit between 1 and 365 days
+        return view(*args, **kwargs)
+    return wrapper
 
 
 @app.route('/')
-def index():
+@validated_days
+def index(days):
     """Main dashboard page."""
-    from flask import request
-    days = request.args.get('days', default=DEFAULT_DAYS_LOOKBACK, type=int)
-    days = max(1, min(days, 365))  # Limit between 1 and 365 days
     return render_template('index.html', default_days=days)
 
 
 @app.route('/api/data')
-def api_data():
+@validated_days
+def api_data(days):
     """JSON API endpoint for CVE data."""
-    from flask import request
-    days = request.args.get('days', default=DEFAULT_DAYS_LOOKBACK, type=int)
-    days = max(1, min(days, 365))  # Limit between 1 and 365 days
+    ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids, built_at = get_filtered_data(days)
+    last_updated = built_at or utc_timestamp()
+    formatted_data, _ = build_response(ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids)
     
-    ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids = fetch_and_filter_data(days)
-    formatted_data = format_cve_data(ics_filtered, cisa_kev_cve_ids)
-    
-    return jsonify({
+    response = jsonify({
+        'success': True,
+        'data': formatted_data,
+        'days': days,
+        'last_updated': last_updated
+    })
+    return conditional_response(response, built_at)
+
+
+@app.route('/api/dashboard')
+@validated_days
+def api_dashboard(days):
+    """JSON API endpoint for CVE data and statistics together."""
+    ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids, built_at = get_filtered_data(days)
+    last_updated = built_at or utc_timestamp()
+    formatted_data, stats = build_response(ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids)
+    
+    response = jsonify({
         'success': True,
         'data': formatted_data,
+        'stats': summarize_statistics(stats, days, last_updated),
         'days': days,
-        'last_updated': datetime.utcnow().isoformat() + 'Z'
+        'last_updated': last_updated
+    })
+    return conditional_response(response, built_at)
+
+
+@app.route('/api/cve/<cve_id>')
+@validated_days
+def api_cve(cve_id, days):
+    """JSON API endpoint for the full description of a single CVE."""
+    (nvd_items, kev_items), _, _, _, _ = get_filtered_data(days)
+    
+    nvd_match = next((cve for cve, _ in nvd_items if get_cve_id(cve) == cve_id), None)
+    if nvd_match is not None:
+        description = get_nvd_description(nvd_match) or "No description available"
+        source = 'NVD'
+    else:
+        kev_match = next((kev for kev in kev_items if get_cve_id(kev) == cve_id), None)
+        if kev_match is None:
+            return jsonify({
+                'success': False,
+                'error': f'{cve_id} not found in the last {days} days'
+            }), 404
+        description = get_cisa_kev_details(kev_match).get('vulnerability_name', '')
+        source = 'CISA KEV'
+    
+    return jsonify({
+        'success': True,
+        'data': {
+            'cve_id': cve_id,
+            'full_description': description,
+            'source': source
+        }
     })
 
 
 @app.route('/api/diagnostics')
 def api_diagnostics():
     """Diagnostic endpoint to check CISA KEV and NVD overlap."""
-    from flask import request
-    
     logger.info("Running diagnostics to check CISA KEV and NVD overlap...")
     
-    # Fetch recent CISA KEV entries (from last 30 days)
-    cisa_client = CISAClient()
-    try:
-        recent_kevs = cisa_client.get_recent_kevs(days=30)
-    except Exception as e:
-        logger.error(f"Error fetching CISA KEV: {e}", exc_info=True)
-        recent_kevs = []
-    
-    # Also fetch ALL CISA KEV catalog to compare
-    try:
-        all_kevs = cisa_client.fetch_kev_catalog()
-    except Exception as e:
-        logger.error(f"Error fetching full CISA KEV catalog: {e}", exc_info=True)
-        all_kevs = []
+    # Fetch NVD CVEs, recent CISA KEV entries and the full KEV catalog
+    # for the last 30 days
+    nvd_cves, recent_kevs, all_kevs, all_cisa_cve_ids = fetch_sources(days=30)
     
-    # Get CVE IDs from CISA KEV
-    cisa_cve_ids = {get_cve_id(kev) for kev in recent_kevs if get_cve_id(kev)}
-    all_cisa_cve_ids = {get_cve_id(kev) for kev in all_kevs if get_cve_id(kev)}
+    # Index recent CISA KEV entries and NVD CVEs by CVE ID once
+    # (first entry wins, as a linear search would)
+    kev_by_id = {}
+    for kev in recent_kevs:
+        cve_id = get_cve_id(kev)
+        if cve_id:
+            kev_by_id.setdefault(cve_id, kev)
     
-    # Fetch NVD CVEs from last 30 days
-    days = 30
-    nvd_client = NVDClient()
-    try:
-        nvd_cves = nvd_client.fetch_recent_cves(days=days)
-    except Exception as e:
-        logger.error(f"Error fetching NVD data: {e}", exc_info=True)
-        nvd_cves = []
+    nvd_by_id = {}
+    for cve in nvd_cves:
+        cve_id = get_cve_id(cve)
+        if cve_id:
+            nvd_by_id.setdefault(cve_id, cve)
     
-    nvd_cve_ids = {get_cve_id(cve) for cve in nvd_cves if get_cve_id(cve)}
+    cisa_cve_ids = kev_by_id.keys()
+    nvd_cve_ids = nvd_by_id.keys()
     
     # Find overlaps
-    overlap_recent = cisa_cve_ids.intersection(nvd_cve_ids)
+    overlap_recent = cisa_cve_ids & nvd_cve_ids
     overlap_all = all_cisa_cve_ids.intersection(nvd_cve_ids)
     
     # Find CISA KEV CVEs NOT in recent NVD (might be older CVEs)
@@ -299,10 +805,8 @@ def api_diagnostics():
     # Get details for overlapping CVEs
     overlap_details = []
     for cve_id in overlap_recent:
-        # Find in CISA KEV
-        kev_entry = next((kev for kev in recent_kevs if get_cve_id(kev) == cve_id), None)
-        # Find in NVD
-        nvd_entry = next((cve for cve in nvd_cves if get_cve_id(cve) == cve_id), None)
+        kev_entry = kev_by_id.get(cve_id)
+        nvd_entry = nvd_by_id.get(cve_id)
         
         if kev_entry and nvd_entry:
             kev_details = get_cisa_kev_details(kev_entry)
@@ -342,41 +846,19 @@ def api_diagnostics():
 
 
 @app.route('/api/stats')
-def api_stats():
+@validated_days
+def api_stats(days):
     """JSON API endpoint for statistics."""
-    from flask import request
-    days = request.args.get('days', default=DEFAULT_DAYS_LOOKBACK, type=int)
-    days = max(1, min(days, 365))  # Limit between 1 and 365 days
+    ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids, built_at = get_filtered_data(days)
+    last_updated = built_at or utc_timestamp()
+    _, stats = build_response(ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids)
+    stats = summarize_statistics(stats, days, last_updated)
     
-    ics_filtered, nvd_cves, cisa_kevs, cisa_kev_cve_ids = fetch_and_filter_data(days)
-    stats = aggregate_statistics(ics_filtered, nvd_cves, cisa_kevs)
-    stats['days'] = days
-    
-    # Convert defaultdicts to regular dicts for JSON serialization
-    stats['severity_distribution'] = dict(stats['severity_distribution'])
-    stats['timeline_data'] = dict(stats['timeline_data'])
-    stats['vendor_product_count'] = dict(stats['vendor_product_count'])
-    
-    # Sort timeline data by date
-    timeline_sorted = sorted(stats['timeline_data'].items())
-    stats['timeline_dates'] = [item[0] for item in timeline_sorted]
-    stats['timeline_counts'] = [item[1] for item in timeline_sorted]
-    
-    # Sort vendor/product by count (top 10)
-    vendor_sorted = sorted(
-        stats['vendor_product_count'].items(),
-        key=lambda x: x[1],
-        reverse=True
-    )[:10]
-    stats['vendor_labels'] = [item[0] for item in vendor_sorted]
-    stats['vendor_counts'] = [item[1] for item in vendor_sorted]
-    
-    stats['last_updated'] = datetime.utcnow().isoformat() + 'Z'
-    
-    return jsonify({
+    response = jsonify({
         'success': True,
         'stats': stats
     })
+    return conditional_response(response, built_at)
 
 
 if __name__ == '__main__':
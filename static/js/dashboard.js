@@ -68,25 +68,20 @@ function updateDays() {
  */
 async function loadData() {
     try {
-        // Load statistics and data in parallel with days parameter
-        const daysParam = `?days=${currentDays}`;
-        const [statsResponse, dataResponse] = await Promise.all([
-            fetch(`/api/stats${daysParam}`),
-            fetch(`/api/data${daysParam}`)
-        ]);
+        // Load statistics and data together with days parameter
+        const response = await fetch(`/api/dashboard?days=${currentDays}`);
 
-        if (!statsResponse.ok || !dataResponse.ok) {
+        if (!response.ok) {
             throw new Error('Failed to fetch data');
         }
 
-        const statsData = await statsResponse.json();
-        const dataData = await dataResponse.json();
+        const dashboardData = await response.json();
 
-        if (statsData.success && dataData.success) {
-            updateStatistics(statsData.stats);
-            updateCharts(statsData.stats);
-            updateVulnerabilities(dataData.data);
-            updateLastUpdated(dataData.last_updated);
+        if (dashboardData.success) {
+            updateStatistics(dashboardData.stats);
+            updateCharts(dashboardData.stats);
+            updateVulnerabilities(dashboardData.data);
+            updateLastUpdated(dashboardData.last_updated);
         }
     } catch (error) {
         console.error('Error loading data:', error);
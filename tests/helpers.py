@@ -0,0 +1,40 @@
+"""Builders for the NVD and CISA KEV objects used across the tests."""
+
+
+def make_nvd_cve(cve_id, description, score, published="2025-01-15T10:00:00.000"):
+    """Build a minimal NVD API v2.0 CVE object."""
+    return {
+        "cve": {
+            "id": cve_id,
+            "published": published,
+            "descriptions": [{"lang": "en", "value": description}],
+            "metrics": {"cvssMetricV31": [{"cvssData": {"baseScore": score}}]},
+        }
+    }
+
+
+def make_kev_entry(
+    cve_id,
+    name,
+    vendor="Foo",
+    product="Gateway",
+    date_added="2025-01-16",
+    due_date=None,
+    ransomware_use=None,
+    notes=None,
+):
+    """Build a minimal CISA KEV entry, with the optional feed fields only when given."""
+    entry = {
+        "cveID": cve_id,
+        "vendorProject": vendor,
+        "product": product,
+        "vulnerabilityName": name,
+        "dateAdded": date_added,
+    }
+    optional_fields = {
+        "dueDate": due_date,
+        "knownRansomwareCampaignUse": ransomware_use,
+        "notes": notes,
+    }
+    entry.update({key: value for key, value in optional_fields.items() if value is not None})
+    return entry
@@ -0,0 +1,115 @@
+"""Tests for the CISA KEV client."""
+
+import datetime
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.cisa_client import CISAClient
+
+
+def make_catalog(days_back):
+    """Build an oldest-first KEV catalog with one entry per day up to today."""
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    return [
+        {
+            "cveID": f"CVE-2025-{days_ago:04d}",
+            "dateAdded": (today - datetime.timedelta(days=days_ago)).isoformat(),
+        }
+        for days_ago in range(days_back, -1, -1)
+    ]
+
+
+def cve_ids(entries):
+    """Return the CVE IDs of KEV entries."""
+    return [entry["cveID"] for entry in entries]
+
+
+class TestKevCache(unittest.TestCase):
+    """Test cases for the on-disk KEV catalog cache."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.client = CISAClient()
+        self.client.cache_file = Path(self.tmp_dir.name) / "cisa_kev.pickle"
+
+    def test_save_and_load_round_trip(self):
+        """A saved catalog and its validators are restored by a new load."""
+        self.client._catalog = [{"cveID": "CVE-2025-0001"}]
+        self.client._etag = '"abc"'
+        self.client._last_modified = "Wed, 15 Jan 2025 10:00:00 GMT"
+        self.client._save_cached_catalog()
+
+        restored = CISAClient()
+        restored.cache_file = self.client.cache_file
+        restored._load_cached_catalog()
+
+        self.assertEqual(restored._catalog, [{"cveID": "CVE-2025-0001"}])
+        self.assertEqual(restored._etag, '"abc"')
+        self.assertEqual(restored._last_modified, "Wed, 15 Jan 2025 10:00:00 GMT")
+        self.assertEqual(list(Path(self.tmp_dir.name).iterdir()), [self.client.cache_file])
+
+    def test_malformed_cache_is_a_miss(self):
+        """Caches with a missing key, wrong type or garbage bytes are ignored."""
+        payloads = [
+            pickle.dumps({"etag": '"abc"'}),
+            pickle.dumps(["not", "a", "dict"]),
+            pickle.dumps({"vulnerabilities": None}),
+            b"not a pickle",
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.client.cache_file.write_bytes(payload)
+                self.client._catalog = None
+                self.client._etag = None
+
+                self.client._load_cached_catalog()
+
+                self.assertIsNone(self.client._catalog)
+                self.assertIsNone(self.client._etag)
+
+    def test_missing_cache_is_a_miss(self):
+        """Loading without a cache file leaves the client empty."""
+        self.client._load_cached_catalog()
+
+        self.assertIsNone(self.client._catalog)
+
+
+class TestFilterRecentKevs(unittest.TestCase):
+    """Test cases for selecting recently added KEV entries."""
+
+    def setUp(self):
+        self.client = CISAClient()
+        self.catalog = make_catalog(100)
+        # Entries added on or after today - 7 days, in oldest-first order
+        self.expected = [f"CVE-2025-{days_ago:04d}" for days_ago in range(7, -1, -1)]
+
+    def test_oldest_first_catalog(self):
+        """An oldest-first catalog yields the recent entries in feed order."""
+        recent = self.client.filter_recent_kevs(self.catalog, days=7)
+
+        self.assertEqual(cve_ids(recent), self.expected)
+
+    def test_newest_first_catalog(self):
+        """A newest-first catalog yields the same entries, in its own order."""
+        recent = self.client.filter_recent_kevs(self.catalog[::-1], days=7)
+
+        self.assertEqual(cve_ids(recent), self.expected[::-1])
+
+    def test_unknown_order_scans_everything(self):
+        """Without a dateAdded at either end, every entry is checked."""
+        catalog = [{"cveID": "CVE-NO-DATE"}] + self.catalog[::-1] + [{"cveID": "CVE-NO-DATE"}]
+
+        recent = self.client.filter_recent_kevs(catalog, days=7)
+
+        self.assertEqual(cve_ids(recent), self.expected[::-1])
+
+    def test_empty_catalog(self):
+        """An empty catalog yields no entries."""
+        self.assertEqual(self.client.filter_recent_kevs([], days=7), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""Tests for the ICS vulnerability filters."""
+
+import unittest
+
+from src.filters import build_cve_record, deduplicate_records, filter_ics_records
+from tests.helpers import make_kev_entry, make_nvd_cve
+
+KEYWORDS = ["SCADA", "PLC", "Siemens"]
+
+
+class TestDeduplicateRecords(unittest.TestCase):
+    """Test cases for merging NVD and CISA KEV records."""
+
+    def test_nvd_record_wins_and_is_tagged(self):
+        """An NVD CVE also listed in KEV collapses into one in_kev NVD record."""
+        nvd = make_nvd_cve("CVE-2025-0001", "Siemens PLC overflow", 9.8)
+        kev = make_kev_entry("CVE-2025-0001", "Siemens PLC Overflow")
+
+        records = deduplicate_records(build_cve_record(cve) for cve in [nvd, kev])
+
+        self.assertEqual(len(records), 1)
+        self.assertTrue(records[0]["is_nvd"])
+        self.assertTrue(records[0]["in_kev"])
+        self.assertIs(records[0]["kev"], kev)
+
+    def test_records_with_distinct_ids_are_kept(self):
+        """Records with different CVE IDs are all kept, in first-seen order."""
+        nvd = make_nvd_cve("CVE-2025-0001", "Siemens PLC overflow", 9.8)
+        kev = make_kev_entry("CVE-2025-0002", "SCADA bypass")
+
+        records = deduplicate_records(build_cve_record(cve) for cve in [nvd, kev])
+
+        self.assertEqual([record["id"] for record in records], ["CVE-2025-0001", "CVE-2025-0002"])
+
+
+class TestFilterIcsRecords(unittest.TestCase):
+    """Test cases for the ICS keyword and severity filter."""
+
+    def filter_ids(self, cves, dedup):
+        """Return the IDs of the CVEs that pass the filter."""
+        records = [build_cve_record(cve) for cve in cves]
+        if dedup:
+            records = deduplicate_records(records)
+        return [record["id"] for record in filter_ics_records(records, KEYWORDS, min_severity=7.0)]
+
+    def test_keyword_only_in_kev_name_survives_merge(self):
+        """A merged CVE still matches on a keyword found only in the KEV name."""
+        cves = [
+            make_nvd_cve("CVE-X", "Buffer overflow in web server", 7.5),
+            make_kev_entry("CVE-X", "Foo SCADA Gateway Buffer Overflow"),
+        ]
+
+        self.assertEqual(self.filter_ids(cves, dedup=False), ["CVE-X"])
+        self.assertEqual(self.filter_ids(cves, dedup=True), ["CVE-X"])
+
+    def test_kev_membership_bypasses_severity_gate(self):
+        """A low-scoring NVD CVE listed in KEV passes once merged."""
+        cves = [
+            make_nvd_cve("CVE-Y", "Siemens PLC issue", 5.0),
+            make_kev_entry("CVE-Y", "Siemens PLC Issue"),
+        ]
+
+        self.assertEqual(self.filter_ids(cves, dedup=True), ["CVE-Y"])
+
+    def test_low_severity_nvd_cve_is_rejected(self):
+        """A low-scoring NVD CVE outside KEV is filtered out despite a keyword match."""
+        cves = [make_nvd_cve("CVE-Z", "SCADA display glitch", 4.0)]
+
+        self.assertEqual(self.filter_ids(cves, dedup=True), [])
+
+    def test_no_keyword_match_is_rejected(self):
+        """A high-scoring CVE without any ICS keyword is filtered out."""
+        cves = [make_nvd_cve("CVE-W", "XSS in a blog engine", 9.0)]
+
+        self.assertEqual(self.filter_ids(cves, dedup=True), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
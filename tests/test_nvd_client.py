@@ -0,0 +1,68 @@
+"""Tests for the NVD API client."""
+
+import unittest
+from unittest import mock
+
+from src import nvd_client
+from src.nvd_client import MAX_FETCH_ATTEMPTS, NVDClient
+
+
+def make_response(status_code, content=b"{}"):
+    """Build a stand-in for a requests response."""
+    return mock.Mock(status_code=status_code, content=content, text=content.decode())
+
+
+class TestFetchPage(unittest.TestCase):
+    """Test cases for fetching and retrying a single NVD page."""
+
+    def setUp(self):
+        self.client = NVDClient()
+        self.client.rate_limiter = mock.Mock()
+        self.client.session = mock.Mock()
+
+        sleep = mock.patch.object(nvd_client.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def test_session_does_not_retry_underneath_the_limiter(self):
+        """The NVD session adapter sends each request once."""
+        adapter = NVDClient().session.get_adapter(nvd_client.NVD_API_ENDPOINT)
+
+        self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_retries_go_through_the_rate_limiter(self):
+        """Every retry after a 429 or 5xx acquires the rate limiter first."""
+        self.client.session.get.side_effect = [
+            make_response(503),
+            make_response(429),
+            make_response(200, b'{"totalResults": 0}'),
+        ]
+
+        data = self.client._fetch_page({"startIndex": 0})
+
+        self.assertEqual(data, {"totalResults": 0})
+        self.assertEqual(self.client.session.get.call_count, 3)
+        self.assertEqual(self.client.rate_limiter.acquire.call_count, 3)
+        self.sleep.assert_has_calls([
+            mock.call(nvd_client.SERVER_ERROR_RETRY_DELAY),
+            mock.call(nvd_client.RATE_LIMITED_RETRY_DELAY),
+        ])
+
+    def test_gives_up_after_max_attempts(self):
+        """A page that keeps failing is given up on after MAX_FETCH_ATTEMPTS."""
+        self.client.session.get.return_value = make_response(502)
+
+        self.assertIsNone(self.client._fetch_page({"startIndex": 0}))
+        self.assertEqual(self.client.session.get.call_count, MAX_FETCH_ATTEMPTS)
+        self.assertEqual(self.client.rate_limiter.acquire.call_count, MAX_FETCH_ATTEMPTS)
+
+    def test_client_errors_are_not_retried(self):
+        """Other error statuses fail the page straight away."""
+        self.client.session.get.return_value = make_response(404)
+
+        self.assertIsNone(self.client._fetch_page({"startIndex": 0}))
+        self.assertEqual(self.client.session.get.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+"""Tests for the dashboard web application."""
+
+import copy
+import threading
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from unittest import mock
+
+from src import web_app
+from src.filters import attach_parsed_dates
+from src.nvd_client import RESULTS_PER_PAGE
+from tests.helpers import make_kev_entry, make_nvd_cve
+
+
+def make_nvd_page(*cve_ids):
+    """Build a single-page NVD API response."""
+    return {
+        "totalResults": len(cve_ids),
+        "vulnerabilities": [{"cve": {"id": cve_id}} for cve_id in cve_ids],
+    }
+
+
+def published_days_ago(days):
+    """Return the NVD published timestamp for days before now."""
+    published = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+    return published.isoformat(timespec="milliseconds")
+
+
+def added_days_ago(days):
+    """Return the KEV dateAdded for days before today."""
+    return (date.today() - timedelta(days=days)).isoformat()
+
+
+class WebAppTestCase(unittest.TestCase):
+    """Base class isolating the fetch cache, the snapshot and the KEV feed."""
+
+    # KEV catalog served by the patched CISA client
+    KEV_CATALOG = []
+
+    # Snapshot in place when each test starts
+    INITIAL_SNAPSHOT = None
+
+    def setUp(self):
+        self.patch(web_app, "_fetch_cache", web_app.TTLCache(maxsize=16, ttl=60))
+        self.patch(web_app, "_snapshot", copy.deepcopy(self.INITIAL_SNAPSHOT))
+        self.patch(
+            web_app._cisa_client,
+            "fetch_kev_catalog",
+            side_effect=lambda: copy.deepcopy(self.KEV_CATALOG),
+        )
+
+    def patch(self, target, attribute, *args, **kwargs):
+        """Patch an attribute of target until the test ends and return the mock."""
+        patcher = mock.patch.object(target, attribute, *args, **kwargs)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
+
+
+class TestBuildResponse(unittest.TestCase):
+    """Test cases for formatting the filtered CVEs."""
+
+    def test_kev_merged_nvd_row_keeps_kev_details(self):
+        """An NVD CVE merged with its KEV entry carries the KEV fields and is rated CRITICAL."""
+        nvd = make_nvd_cve("CVE-2025-0001", "Siemens PLC overflow", 5.0)
+        kev = make_kev_entry(
+            "CVE-2025-0001",
+            "Siemens SIMATIC Overflow",
+            vendor="Siemens",
+            product="SIMATIC",
+            due_date="2025-02-06",
+            ransomware_use="Known",
+            notes="https://example.com/advisory",
+        )
+        attach_parsed_dates([nvd, kev])
+
+        formatted, stats = web_app.build_response(
+            web_app.filter_sources([nvd], [kev]), [nvd], [kev], frozenset({"CVE-2025-0001"})
+        )
+
+        self.assertEqual(len(formatted), 1)
+        entry = formatted[0]
+        self.assertEqual(entry["source"], "NVD")
+        self.assertEqual(entry["severity_score"], 5.0)
+        self.assertEqual(entry["severity_rating"], "CRITICAL")
+        self.assertEqual(entry["vendor_project"], "Siemens")
+        self.assertEqual(entry["product"], "SIMATIC")
+        self.assertEqual(entry["due_date"], "2025-02-06")
+        self.assertEqual(entry["known_ransomware_use"], "Known")
+        self.assertEqual(entry["notes"], "https://example.com/advisory")
+        self.assertEqual(stats["critical_count"], 1)
+        self.assertEqual(stats["cisa_kev_count"], 1)
+
+
+class TestFetchCache(WebAppTestCase):
+    """Test cases for caching upstream fetches."""
+
+    def test_nvd_failure_is_not_cached(self):
+        """After a failed NVD fetch, the next fetch goes upstream again."""
+        fetch_page = mock.Mock(side_effect=[None, make_nvd_page("CVE-2025-0001")])
+
+        with mock.patch.object(web_app._nvd_client, "_fetch_page", fetch_page):
+            nvd_cves, _, _, _ = web_app.fetch_sources(days=7)
+            self.assertEqual(nvd_cves, [])
+
+            nvd_cves, _, _, _ = web_app.fetch_sources(days=7)
+
+        self.assertEqual(fetch_page.call_count, 2)
+        self.assertEqual([cve["cve"]["id"] for cve in nvd_cves], ["CVE-2025-0001"])
+
+    def test_partial_nvd_results_are_not_cached(self):
+        """A fetch that loses a later page is not cached either."""
+        first_page = {
+            "totalResults": 2 * RESULTS_PER_PAGE,
+            "vulnerabilities": [{"cve": {"id": "CVE-2025-0001"}}],
+        }
+        fetch_page = mock.Mock(side_effect=[first_page, None, make_nvd_page("CVE-2025-0002")])
+
+        with mock.patch.object(web_app._nvd_client, "_fetch_page", fetch_page):
+            web_app.fetch_sources(days=7)
+            nvd_cves, _, _, _ = web_app.fetch_sources(days=7)
+
+        self.assertEqual(fetch_page.call_count, 3)
+        self.assertEqual([cve["cve"]["id"] for cve in nvd_cves], ["CVE-2025-0002"])
+
+    def test_successful_fetch_is_cached(self):
+        """A successful NVD fetch is served from the cache the next time."""
+        fetch_page = mock.Mock(return_value=make_nvd_page("CVE-2025-0001"))
+
+        with mock.patch.object(web_app._nvd_client, "_fetch_page", fetch_page):
+            web_app.fetch_sources(days=7)
+            web_app.fetch_sources(days=7)
+
+        self.assertEqual(fetch_page.call_count, 1)
+
+
+class TestSliceSnapshot(WebAppTestCase):
+    """Test cases for serving shorter windows from the snapshot."""
+
+    NVD_CVES = [
+        make_nvd_cve("CVE-2025-0001", "Siemens PLC overflow", 9.8, published_days_ago(20.5)),
+        make_nvd_cve("CVE-2025-0002", "SCADA HMI bypass", 5.0, published_days_ago(10.5)),
+        make_nvd_cve("CVE-2025-0003", "Modbus gateway crash", 7.5, published_days_ago(5.5)),
+        make_nvd_cve("CVE-2025-0004", "Siemens SIMATIC flaw", 4.0, published_days_ago(2.5)),
+        make_nvd_cve("CVE-2025-0005", "Web browser bug", 9.0, published_days_ago(1.5)),
+    ]
+
+    # Oldest first, as the feed is published
+    KEV_CATALOG = [
+        make_kev_entry("CVE-2024-9999", "Siemens SIMATIC RCE", date_added=added_days_ago(25)),
+        make_kev_entry("CVE-2025-0001", "Siemens PLC Overflow", date_added=added_days_ago(15)),
+        make_kev_entry("CVE-2025-0002", "SCADA HMI Bypass", date_added=added_days_ago(3)),
+        make_kev_entry("CVE-2025-0004", "Siemens SIMATIC Flaw", date_added=added_days_ago(2)),
+    ]
+
+    def setUp(self):
+        super().setUp()
+
+        async def fetch_recent_cves_async(days=7, **kwargs):
+            cutoff = published_days_ago(days)
+            return [copy.deepcopy(cve) for cve in self.NVD_CVES if cve["cve"]["published"] >= cutoff]
+
+        self.patch(web_app._nvd_client, "fetch_recent_cves_async", fetch_recent_cves_async)
+
+    def test_slice_matches_on_demand_fetch(self):
+        """Every window inside the snapshot formats exactly as an on-demand fetch would."""
+        web_app.refresh_snapshot(days=30)
+
+        for days in (1, 4, 7, 14, 21):
+            with self.subTest(days=days):
+                *sliced, built_at = web_app.get_filtered_data(days)
+                on_demand = web_app.fetch_and_filter_data(days)
+
+                self.assertIsNone(built_at)
+                self.assertEqual(web_app.build_response(*sliced), web_app.build_response(*on_demand))
+
+
+class TestRefreshSnapshot(WebAppTestCase):
+    """Test cases for the background snapshot refresh."""
+
+    INITIAL_SNAPSHOT = {"days": 7, "built_at": "previous"}
+
+    def test_failed_refresh_keeps_previous_snapshot(self):
+        """A refresh whose NVD fetch fails leaves the old snapshot in place."""
+        with mock.patch.object(web_app._nvd_client, "_fetch_page", return_value=None):
+            with self.assertRaises(Exception):
+                web_app.refresh_snapshot(days=7)
+
+        self.assertEqual(web_app._snapshot["built_at"], "previous")
+
+    def test_successful_refresh_replaces_snapshot(self):
+        """A refresh with both sources available builds a new snapshot."""
+        with mock.patch.object(web_app._nvd_client, "_fetch_page", return_value=make_nvd_page()):
+            web_app.refresh_snapshot(days=7)
+
+        self.assertNotEqual(web_app._snapshot["built_at"], "previous")
+
+
+
+class TestFirstRefresh(WebAppTestCase):
+    """Test cases for requests served before the first snapshot exists."""
+
+    def setUp(self):
+        super().setUp()
+        self.release_nvd = threading.Event()
+        self.nvd_fetches = 0
+
+        async def fetch_recent_cves_async(days=7, **kwargs):
+            self.nvd_fetches += 1
+            self.release_nvd.wait(timeout=5)
+            return []
+
+        self.waiting = threading.Event()
+        test = self
+
+        class WatchedEvent(threading.Event):
+            """Event that reports when a request starts waiting on it."""
+
+            def wait(self, timeout=None):
+                test.waiting.set()
+                return super().wait(timeout)
+
+        self.patch(web_app._nvd_client, "fetch_recent_cves_async", fetch_recent_cves_async)
+        self.patch(web_app, "_refresh_thread", mock.sentinel.refresh_thread)
+        self.patch(web_app, "_first_refresh_done", WatchedEvent())
+        self.addCleanup(self.release_nvd.set)
+
+    def test_first_request_waits_for_the_refresher(self):
+        """A cold-start request waits for the running refresh instead of crawling NVD again."""
+        results = []
+        refresher = threading.Thread(target=web_app._refresh_once)
+        request = threading.Thread(
+            target=lambda: results.append(web_app.get_filtered_data(web_app.DEFAULT_DAYS_LOOKBACK))
+        )
+        refresher.start()
+        request.start()
+
+        self.assertTrue(self.waiting.wait(timeout=5))
+        self.release_nvd.set()
+        refresher.join(timeout=5)
+        request.join(timeout=5)
+
+        self.assertEqual(self.nvd_fetches, 1)
+        self.assertEqual(results[0][-1], web_app._snapshot["built_at"])
+
+
+if __name__ == "__main__":
+    unittest.main()